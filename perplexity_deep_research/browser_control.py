@@ -5,10 +5,18 @@ Provides Chrome detection, interactive/non-interactive prompting,
 quit/relaunch functionality, and structured result tracking.
 """
 
+import atexit
+import functools
 import os
+import re
+import select
+import shutil
 import subprocess
 import sys
+import threading
 import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -28,27 +36,270 @@ class ChromeAccessResult:
     accessible: bool
 
 
-def is_chrome_running() -> bool:
-    """Check if Google Chrome is currently running on macOS.
+_BRIDGE_SENTINEL = "__END__"
+# A fresh bridge must echo a no-op within this long before scripts use it
+_BRIDGE_PROBE_TIMEOUT = 1.0  # seconds
+_PROMPT_RE = re.compile(r"^(?:>> |=> )+")
+
 
-    Uses AppleScript to query System Events for running processes.
+class _OsascriptBridge:
+    """Long-lived ``osascript -i`` interpreter fed scripts over stdin.
+
+    Amortizes osascript startup (~90ms per spawn) across the quick Chrome
+    queries. Interactive mode evaluates input line by line, so only
+    single-line scripts may be sent through the bridge.
+    """
+
+    def __init__(self, args: tuple[str, ...] = ("osascript", "-i")):
+        self._proc = subprocess.Popen(
+            list(args),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+
+    def alive(self) -> bool:
+        """Return True while the interpreter process is still running."""
+        return self._proc.poll() is None
+
+    def run(self, script: str, timeout: float) -> str:
+        """Evaluate a one-line script and return its printed result.
+
+        Args:
+            script: Single-line AppleScript source
+            timeout: Seconds to wait for the result
+
+        Returns:
+            str: Result of the last evaluated expression ("" if none printed)
+
+        Raises:
+            OSError: If the script could not be sent (it did not run)
+            subprocess.TimeoutExpired: If no result arrives within timeout
+            subprocess.SubprocessError: If the interpreter exited after the
+                script was sent
+        """
+        proc = self._proc
+        proc.stdin.write(f'{script}\n"{_BRIDGE_SENTINEL}"\n'.encode())
+        proc.stdin.flush()
+
+        fd = proc.stdout.fileno()
+        deadline = time.monotonic() + timeout
+        buf = b""
+        while _BRIDGE_SENTINEL.encode() not in buf:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise subprocess.TimeoutExpired(proc.args, timeout)
+            data = os.read(fd, 4096)
+            if not data:
+                raise subprocess.SubprocessError("osascript bridge exited")
+            buf += data
+
+        lines = buf.decode("utf-8", errors="replace").splitlines()
+        results = []
+        for line in lines:
+            if _BRIDGE_SENTINEL in line:
+                break
+            line = _PROMPT_RE.sub("", line).strip()
+            if line:
+                results.append(line)
+        return results[-1] if results else ""
+
+    def close(self) -> None:
+        """Close stdin so the interpreter exits, killing it if it lingers.
+
+        The process is always reaped and its stdout pipe closed.
+        """
+        proc = self._proc
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait()
+        finally:
+            proc.stdout.close()
+
+
+_bridge: _OsascriptBridge | None = None
+# Set once the bridge fails its probe or times out; osascript -e is used after
+_bridge_disabled = False
+# Serializes use of the shared bridge; its stdin/stdout carry one script at a time
+_bridge_lock = threading.Lock()
+
+
+def _discard_bridge() -> None:
+    """Close and forget the shared bridge. Caller must hold _bridge_lock."""
+    global _bridge
+    if _bridge is not None:
+        _bridge.close()
+        _bridge = None
+
+
+def _close_bridge() -> None:
+    """Shut down the shared osascript bridge, if one was started."""
+    with _bridge_lock:
+        _discard_bridge()
+
+
+atexit.register(_close_bridge)
+
+
+def _get_bridge() -> _OsascriptBridge | None:
+    """Return a live shared bridge, spawning and probing one if needed.
+
+    A new bridge must answer a no-op within _BRIDGE_PROBE_TIMEOUT, which
+    catches an ``osascript -i`` that buffers its output on a pipe before any
+    real script is sent. Caller must hold _bridge_lock.
+
+    Returns:
+        _OsascriptBridge | None: The bridge, or None if it is unavailable or
+        disabled for this process
+    """
+    global _bridge, _bridge_disabled
+    if _bridge_disabled:
+        return None
+    if _bridge is not None and _bridge.alive():
+        return _bridge
+
+    _discard_bridge()
+    try:
+        bridge = _OsascriptBridge()
+    except OSError:
+        _bridge_disabled = True
+        return None
+    try:
+        bridge.run("", _BRIDGE_PROBE_TIMEOUT)
+    except (OSError, subprocess.SubprocessError):
+        bridge.close()
+        _bridge_disabled = True
+        return None
+    _bridge = bridge
+    return bridge
+
+
+def _run_osascript(script: str, timeout: float) -> subprocess.CompletedProcess:
+    """Run a single-line AppleScript, preferring the shared osascript bridge.
+
+    Spawns the bridge on first use and respawns it if it has died (e.g. after
+    sleep/wake). Uses a one-shot ``osascript -e`` process when the bridge is
+    unavailable or the script could not be sent. A script that was sent is
+    never re-sent, since it may already have run (e.g. quitting Chrome); a
+    bridge timeout disables the bridge for the rest of the process instead.
+
+    Args:
+        script: Single-line AppleScript source
+        timeout: Seconds to wait for the result
+
+    Returns:
+        subprocess.CompletedProcess: Result with stdout holding the script output
+
+    Raises:
+        subprocess.TimeoutExpired: If the script doesn't finish within timeout
+        subprocess.SubprocessError: If the bridge or osascript process fails
+    """
+    global _bridge_disabled
+    with _bridge_lock:
+        bridge = _get_bridge()
+        if bridge is not None:
+            try:
+                stdout = bridge.run(script, timeout)
+                return subprocess.CompletedProcess(["osascript", "-i"], 0, stdout, "")
+            except OSError:
+                _discard_bridge()  # Not sent; run it as its own process
+            except subprocess.TimeoutExpired:
+                _discard_bridge()
+                _bridge_disabled = True
+                raise
+            except subprocess.SubprocessError:
+                _discard_bridge()
+                raise
+
+    return subprocess.run(
+        ["osascript", "-e", script],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+
+
+_CHROME_RUNNING_TTL = 0.2  # seconds
+_chrome_running_cache: tuple[float, bool] | None = None
+
+
+@functools.cache
+def _has_pgrep() -> bool:
+    """Check once whether pgrep is on PATH, so missing pgrep costs no spawns.
+
+    Returns:
+        bool: True if pgrep is available, False otherwise
+    """
+    return shutil.which("pgrep") is not None
+
+
+def _refresh_chrome_running() -> bool:
+    """Query whether Chrome is running, bypassing and updating the cache.
+
+    Uses ``pgrep -x`` to match the Chrome process by name, falling back to
+    an AppleScript System Events query if pgrep is not installed.
 
     Returns:
         bool: True if Chrome is running, False otherwise
     """
-    script = 'tell application "System Events" to (name of processes) contains "Google Chrome"'
+    global _chrome_running_cache
+    if not _has_pgrep():
+        running = _query_system_events()
+        _chrome_running_cache = (time.monotonic(), running)
+        return running
     try:
         result = subprocess.run(
-            ["osascript", "-e", script],
+            ["pgrep", "-x", "Google Chrome"],
             capture_output=True,
-            text=True,
-            timeout=5,
+            timeout=2,
         )
+        running = result.returncode == 0
+    except FileNotFoundError:
+        running = _query_system_events()
+    except (subprocess.TimeoutExpired, subprocess.SubprocessError):
+        running = False
+    _chrome_running_cache = (time.monotonic(), running)
+    return running
+
+
+def _query_system_events() -> bool:
+    """Ask System Events whether a "Google Chrome" process exists.
+
+    Returns:
+        bool: True if Chrome is running, False otherwise
+    """
+    script = 'tell application "System Events" to (name of processes) contains "Google Chrome"'
+    try:
+        result = _run_osascript(script, timeout=5)
         return result.stdout.strip().lower() == "true"
     except (subprocess.TimeoutExpired, subprocess.SubprocessError):
         return False
 
 
+def _invalidate_chrome_running() -> None:
+    """Drop the cached is_chrome_running() result after changing Chrome's state."""
+    global _chrome_running_cache
+    _chrome_running_cache = None
+
+
+def is_chrome_running() -> bool:
+    """Check if Google Chrome is currently running on macOS.
+
+    Results are cached for 200ms so back-to-back checks (e.g. in
+    ensure_chrome_accessible) share one query.
+
+    Returns:
+        bool: True if Chrome is running, False otherwise
+    """
+    cached = _chrome_running_cache
+    if cached is not None and time.monotonic() - cached[0] < _CHROME_RUNNING_TTL:
+        return cached[1]
+    return _refresh_chrome_running()
+
+
 def prompt_close_chrome() -> bool:
     """Prompt user for permission to close Chrome.
 
@@ -86,60 +337,141 @@ def prompt_close_chrome() -> bool:
         return False
 
 
-def quit_chrome() -> bool:
-    """Gracefully quit Google Chrome using AppleScript.
-
-    Sends quit command and polls for process exit with 500ms intervals,
-    up to 10 second timeout.
+def _get_chrome_pid() -> int | None:
+    """Look up the pid of the main Google Chrome process.
 
     Returns:
-        bool: True if Chrome quit successfully, False otherwise
+        int | None: Chrome's pid, or None if not running or pgrep is unavailable
     """
-    quit_script = 'tell application "Google Chrome" to quit'
+    if not _has_pgrep():
+        return None
     try:
-        subprocess.run(
-            ["osascript", "-e", quit_script],
+        result = subprocess.run(
+            ["pgrep", "-x", "Google Chrome"],
             capture_output=True,
             text=True,
             timeout=5,
         )
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError):
-        return False
+    except (OSError, subprocess.TimeoutExpired, subprocess.SubprocessError):
+        return None
 
-    max_wait = 10.0
-    poll_interval = 0.5
-    elapsed = 0.0
+    if result.returncode != 0:
+        return None
+    try:
+        return int(result.stdout.split()[0])
+    except (IndexError, ValueError):
+        return None
+
+
+def _watch_process_exit(pid: int) -> "select.kqueue | None":
+    """Register a kqueue EVFILT_PROC/NOTE_EXIT watch on a process.
+
+    Args:
+        pid: Process to watch
+
+    Returns:
+        select.kqueue | None: Queue that fires once pid exits, or None if
+            registration failed (e.g. ESRCH because the process is already gone)
+    """
+    kq = select.kqueue()
+    event = select.kevent(
+        pid,
+        filter=select.KQ_FILTER_PROC,
+        flags=select.KQ_EV_ADD | select.KQ_EV_ENABLE | select.KQ_EV_ONESHOT,
+        fflags=select.KQ_NOTE_EXIT,
+    )
+    try:
+        kq.control([event], 0, 0)
+    except OSError:
+        kq.close()
+        return None
+    return kq
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float) -> bool:
+    """Poll condition with a tapering schedule until it holds or timeout expires.
 
-    while elapsed < max_wait:
-        time.sleep(poll_interval)
-        elapsed += poll_interval
-        if not is_chrome_running():
+    Sleeps 100ms before the first check and grows the interval by 1.5x per
+    miss, capped at 1 second, so fast state changes are seen quickly without
+    hammering the system on slow ones.
+
+    Args:
+        condition: Zero-argument predicate to poll
+        timeout: Total seconds to keep polling
+
+    Returns:
+        bool: True if condition became true, False on timeout
+    """
+    delay = 0.1
+    deadline = time.monotonic() + timeout
+    while True:
+        time.sleep(delay)
+        if condition():
             return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        delay = min(delay * 1.5, 1.0, remaining)
+
+
+def quit_chrome(pid: int | None = None) -> bool:
+    """Gracefully quit Google Chrome using AppleScript.
+
+    On macOS, registers a kqueue exit watch on Chrome's pid before sending the
+    quit command and blocks until the process exits, up to 10 second timeout.
+    Falls back to polling is_chrome_running() with backoff when the pid
+    can't be found or kqueue is unavailable.
+
+    Args:
+        pid: Chrome's pid if already known; looked up with pgrep otherwise
+
+    Returns:
+        bool: True if Chrome quit successfully, False otherwise
+    """
+    _invalidate_chrome_running()
+    max_wait = 10.0
+    kq = None
+    if hasattr(select, "kqueue"):
+        if pid is None:
+            pid = _get_chrome_pid()
+        if pid is not None:
+            kq = _watch_process_exit(pid)
+
+    quit_script = 'tell application "Google Chrome" to quit'
+    try:
+        try:
+            _run_osascript(quit_script, timeout=5)
+        except (subprocess.TimeoutExpired, subprocess.SubprocessError):
+            return False
+        finally:
+            _invalidate_chrome_running()
+
+        if kq is not None:
+            return bool(kq.control(None, 1, max_wait))
+    finally:
+        if kq is not None:
+            kq.close()
 
-    return False
+    return _wait_for(lambda: not _refresh_chrome_running(), max_wait)
 
 
 def relaunch_chrome() -> bool:
     """Relaunch Google Chrome using AppleScript.
 
-    Activates Chrome and verifies it's running.
+    Activates Chrome and polls with backoff (up to 3 seconds) until it's running.
 
     Returns:
         bool: True if Chrome was relaunched successfully, False otherwise
     """
     activate_script = 'tell application "Google Chrome" to activate'
     try:
-        subprocess.run(
-            ["osascript", "-e", activate_script],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
+        _run_osascript(activate_script, timeout=5)
     except (subprocess.TimeoutExpired, subprocess.SubprocessError):
         return False
+    finally:
+        _invalidate_chrome_running()
 
-    time.sleep(1.0)
-    return is_chrome_running()
+    return _wait_for(_refresh_chrome_running, 3.0)
 
 
 def ensure_chrome_accessible() -> ChromeAccessResult:
@@ -158,10 +490,17 @@ def ensure_chrome_accessible() -> ChromeAccessResult:
     if not was_running:
         return ChromeAccessResult(was_running=False, was_quit=False, accessible=True)
 
-    if not prompt_close_chrome():
-        return ChromeAccessResult(was_running=True, was_quit=False, accessible=False)
+    # Look up the pid for the kqueue watch while the user reads the prompt
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        prefetch = hasattr(select, "kqueue") and _has_pgrep()
+        pid_future = pool.submit(_get_chrome_pid) if prefetch else None
+        if not prompt_close_chrome():
+            return ChromeAccessResult(
+                was_running=True, was_quit=False, accessible=False
+            )
+        pid = pid_future.result() if pid_future is not None else None
 
-    quit_success = quit_chrome()
+    quit_success = quit_chrome(pid)
 
     return ChromeAccessResult(
         was_running=True,
@@ -199,9 +538,29 @@ This is your macOS login password." default answer "" with hidden answer with ti
         return None
 
 
+# Set once access is confirmed; a grant is never revoked mid-process
+_full_disk_access_granted = False
+
+
 def check_full_disk_access() -> bool:
     """Check if terminal has Full Disk Access permission.
 
+    Stats the Chrome cookie file first and only opens it once it is known to
+    exist and be readable. Only a positive result is cached, so a long-lived
+    server notices access granted after the Full Disk Access prompt.
+
+    Returns:
+        bool: True if has access, False otherwise
+    """
+    global _full_disk_access_granted
+    if not _full_disk_access_granted:
+        _full_disk_access_granted = _probe_full_disk_access()
+    return _full_disk_access_granted
+
+
+def _probe_full_disk_access() -> bool:
+    """Test whether the Chrome cookie file can be opened, without caching.
+
     Returns:
         bool: True if has access, False otherwise
     """
@@ -209,14 +568,24 @@ def check_full_disk_access() -> bool:
         Path.home() / "Library/Application Support/Google/Chrome/Default/Cookies"
     )
     try:
-        # Try to open the file - will fail without Full Disk Access
-        with open(cookie_path, "rb") as f:
-            f.read(1)
+        os.stat(cookie_path)
+    except FileNotFoundError:
+        return True  # File doesn't exist, but that's not a permission issue
+    except PermissionError:
+        return False
+
+    if not os.access(cookie_path, os.R_OK):
+        return False
+
+    try:
+        # Opening is what Full Disk Access gates; no need to read any data
+        with open(cookie_path, "rb"):
+            pass
         return True
     except PermissionError:
         return False
     except FileNotFoundError:
-        return True  # File doesn't exist, but that's not a permission issue
+        return True
 
 
 def show_full_disk_access_dialog():
@@ -6,14 +6,17 @@ for Chrome impersonation and automatic cookie refresh on authentication errors.
 """
 
 import json
+import logging
 import random
 import time
 from uuid import uuid4
 
 from curl_cffi import requests
 
-import logging
-import sys
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used without it
+    orjson = None
 
 from .config import (
     API_VERSION,
@@ -21,15 +24,9 @@ from .config import (
     ENDPOINT_AUTH_SESSION,
     ENDPOINT_SSE_ASK,
     MAX_RETRIES,
+    MODE_MAPPING,
     REQUEST_TIMEOUT,
 )
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    stream=sys.stderr,
-)
-logger = logging.getLogger("perplexity-deep-research")
 from .cookies import (
     extract_cookies_with_relaunch,
     get_cookies,
@@ -38,6 +35,73 @@ from .cookies import (
 )
 from .exceptions import AuthenticationError, PerplexityError, RateLimitError
 
+logger = logging.getLogger("perplexity-deep-research")
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so the existing
+# except clauses cover both parsers.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _encode_payload(payload: dict) -> dict:
+    """
+    Build request body kwargs for a JSON payload.
+
+    With orjson the payload is serialized once to bytes, so retries resend
+    the same buffer; otherwise curl_cffi serializes json= on each send.
+
+    Args:
+        payload: JSON-serializable request body
+
+    Returns:
+        dict: Keyword arguments for session.request()
+    """
+    if orjson is None:
+        return {"json": payload}
+    return {
+        "data": orjson.dumps(payload),
+        "headers": {"content-type": "application/json"},
+    }
+
+
+# Normalized once at import; Session copies a Headers instance without
+# re-validating each entry
+_SESSION_HEADERS = requests.Headers(DEFAULT_HEADERS)
+
+# SSE event framing prefixes (matched on raw bytes, no decode per event)
+_MSG_PREFIX = b"event: message\r\ndata: "
+_END_PREFIX = b"event: end_of_stream\r\n"
+_EVENT_SEP = b"\r\n\r\n"
+
+
+def _iter_events(chunks, sep: bytes = _EVENT_SEP):
+    """
+    Split a stream of byte chunks into SSE events.
+
+    Chunks accumulate in one bytearray; each complete event is copied out once
+    and consumed from the front of the buffer.
+
+    Args:
+        chunks: Iterable of bytes as read from the response body
+        sep: Event separator
+
+    Yields:
+        bytes: One event without its trailing separator
+    """
+    buf = bytearray()
+    for chunk in chunks:
+        # Only the tail can complete a separator that was split across chunks
+        start = max(len(buf) - len(sep) + 1, 0)
+        buf += chunk
+        idx = buf.find(sep, start)
+        while idx != -1:
+            with memoryview(buf) as view:
+                event = bytes(view[:idx])
+            del buf[: idx + len(sep)]
+            yield event
+            idx = buf.find(sep)
+    if buf:
+        yield bytes(buf)
+
 
 class PerplexityClient:
     """
@@ -50,9 +114,11 @@ class PerplexityClient:
     def __init__(self):
         """Initialize client with cookies and session bootstrap."""
         cookies = get_cookies()
+        self._last_request_ts = float("-inf")  # monotonic time of last request
+        self._frontend_uuid = str(uuid4())  # stable per client, like a browser tab
         self.session = self._create_session(cookies)
         # Bootstrap session - MUST call this in __init__
-        self.session.get(ENDPOINT_AUTH_SESSION, timeout=REQUEST_TIMEOUT)
+        self._bootstrap_session()
 
     def _create_session(self, cookies: dict) -> requests.Session:
         """
@@ -66,23 +132,47 @@ class PerplexityClient:
         """
         http_cookies = to_http_cookies(cookies)
         session = requests.Session(
-            headers=DEFAULT_HEADERS.copy(),  # 20 Chrome-like headers
+            headers=_SESSION_HEADERS,  # 20 Chrome-like headers
             cookies=http_cookies,
             impersonate="chrome",
         )
         return session
 
+    def _bootstrap_session(self):
+        """Hit the auth session endpoint so Perplexity mints session state."""
+        self.session.get(ENDPOINT_AUTH_SESSION, timeout=REQUEST_TIMEOUT)
+
     def _add_random_delay(self):
-        """Add random delay (1-3s) for rate limiting protection."""
-        time.sleep(random.uniform(1.0, 3.0))
+        """
+        Add a short random delay between rapid requests for rate limiting.
+
+        Skipped when the previous request was over 5s ago (including the
+        first request). Otherwise sleeps 0.1s up to whatever remains of 1s
+        since the previous request.
+        """
+        elapsed = time.monotonic() - self._last_request_ts
+        if elapsed > 5.0:
+            return
+        time.sleep(random.uniform(0.1, max(0.1, 1.0 - elapsed)))
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Issue a single session request and record when it returned."""
+        try:
+            return self.session.request(method, url, timeout=REQUEST_TIMEOUT, **kwargs)
+        finally:
+            self._last_request_ts = time.monotonic()
 
     def _refresh_cookies(self):
-        """Re-extract cookies from Chrome and recreate session."""
+        """
+        Re-extract cookies from Chrome and swap them into the live session.
+
+        The session itself is kept so its pooled connections and TLS state
+        survive the refresh.
+        """
         fresh_cookies = extract_cookies_with_relaunch()
         save_cookies(fresh_cookies)
-        self.session = self._create_session(fresh_cookies)
-        # Re-bootstrap session after refresh
-        self.session.get(ENDPOINT_AUTH_SESSION, timeout=REQUEST_TIMEOUT)
+        self.session.cookies.clear()
+        self.session.cookies.update(to_http_cookies(fresh_cookies))
 
     def _request_with_retry(self, method: str, url: str, **kwargs) -> requests.Response:
         """
@@ -102,15 +192,18 @@ class PerplexityClient:
             PerplexityError: For other HTTP errors
         """
         self._add_random_delay()
-        response = self.session.request(method, url, timeout=REQUEST_TIMEOUT, **kwargs)
+        response = self._send(method, url, **kwargs)
 
         # Handle auth errors with retry
         if response.status_code in (401, 403):
             self._refresh_cookies()
             self._add_random_delay()
-            response = self.session.request(
-                method, url, timeout=REQUEST_TIMEOUT, **kwargs
-            )
+            response = self._send(method, url, **kwargs)
+            if response.status_code in (401, 403):
+                # Fresh cookies alone weren't enough; bootstrap and try once more
+                self._bootstrap_session()
+                self._add_random_delay()
+                response = self._send(method, url, **kwargs)
             if response.status_code in (401, 403):
                 raise AuthenticationError("Authentication failed after retry")
 
@@ -139,51 +232,44 @@ class PerplexityClient:
         Raises:
             PerplexityError: If no valid response or answer found
         """
-        chunks = []
-
-        for chunk in response_stream.iter_lines(delimiter=b"\r\n\r\n"):
-            content = chunk.decode("utf-8")
-
-            if content.startswith("event: message\r\n"):
+        final_response = None
+
+        # Only the last message matters, so keep it raw and parse its nested
+        # 'text' field once after the stream ends
+        # curl_cffi yields chunks as libcurl delivers them; it ignores (and
+        # warns about) chunk_size, so none is passed
+        for chunk in _iter_events(response_stream.iter_content()):
+            if chunk.startswith(_MSG_PREFIX):
                 try:
-                    # Parse JSON after "event: message\r\ndata: " prefix
-                    json_str = content[len("event: message\r\ndata: ") :]
-                    content_json = json.loads(json_str)
-
-                    # Parse nested 'text' field (contains step list)
-                    if "text" in content_json and content_json["text"]:
-                        try:
-                            text_parsed = json.loads(content_json["text"])
-
-                            # Extract answer from FINAL step
-                            if isinstance(text_parsed, list):
-                                for step in text_parsed:
-                                    if step.get("step_type") == "FINAL":
-                                        final_content = step.get("content", {})
-                                        if "answer" in final_content:
-                                            answer_data = json.loads(
-                                                final_content["answer"]
-                                            )
-                                            content_json["answer"] = answer_data.get(
-                                                "answer", ""
-                                            )
-                                            break
-
-                            content_json["text"] = text_parsed
-                        except (json.JSONDecodeError, TypeError, KeyError):
-                            pass
-
-                    chunks.append(content_json)
-                except (json.JSONDecodeError, KeyError):
+                    # Parse JSON payload straight from the bytes after the prefix
+                    final_response = _json_loads(chunk[len(_MSG_PREFIX) :])
+                except (json.JSONDecodeError, UnicodeDecodeError, KeyError):
                     continue
 
-            elif content.startswith("event: end_of_stream\r\n"):
+            elif chunk.startswith(_END_PREFIX):
                 break
 
-        if not chunks:
+        if final_response is None:
             raise PerplexityError("No response received from Perplexity API")
 
-        final_response = chunks[-1]
+        # Parse nested 'text' field (contains step list)
+        if "text" in final_response and final_response["text"]:
+            try:
+                text_parsed = _json_loads(final_response["text"])
+
+                # Extract answer from FINAL step
+                if isinstance(text_parsed, list):
+                    for step in text_parsed:
+                        if step.get("step_type") == "FINAL":
+                            final_content = step.get("content", {})
+                            if "answer" in final_content:
+                                answer_data = _json_loads(final_content["answer"])
+                                final_response["answer"] = answer_data.get("answer", "")
+                                break
+
+                final_response["text"] = text_parsed
+            except (json.JSONDecodeError, TypeError, KeyError):
+                pass
 
         if "answer" not in final_response or not final_response["answer"]:
             raise PerplexityError("No answer found in Perplexity response")
@@ -203,6 +289,7 @@ class PerplexityClient:
             list[str]: List of unique citation URLs, max 10
         """
         sources: list[str] = []
+        seen: set[str] = set()
 
         # 1. Extract from text -> SEARCH_RESULTS step -> web_results
         text_items = response.get("text", [])
@@ -216,8 +303,11 @@ class PerplexityClient:
                             for wr in web_results[:10]:  # Cap at 10
                                 if isinstance(wr, dict):
                                     url = wr.get("url")
-                                    if url and url not in sources:
+                                    if url and url not in seen:
+                                        seen.add(url)
                                         sources.append(url)
+                                        if len(sources) == 10:
+                                            return sources
 
         # 2. Also check widget_data for additional sources (backup)
         widget_data = response.get("widget_data", [])
@@ -225,10 +315,13 @@ class PerplexityClient:
             for wd in widget_data[:5]:
                 if isinstance(wd, dict):
                     url = wd.get("url")
-                    if url and url not in sources and len(sources) < 10:
+                    if url and url not in seen:
+                        seen.add(url)
                         sources.append(url)
+                        if len(sources) == 10:
+                            break
 
-        return sources[:10]  # Final cap at 10 unique URLs
+        return sources  # At most 10 unique URLs
 
     def search(
         self,
@@ -250,15 +343,14 @@ class PerplexityClient:
 
         Returns:
             dict: Response with 'answer', 'citations', 'backend_uuid'
+
+        Raises:
+            PerplexityError: If mode is not a known logical mode
         """
-        # Mode/model mapping
-        mode_mapping = {
-            "deep research": ("copilot", "pplx_alpha"),
-            "pro": ("copilot", "pplx_pro"),
-            "reasoning": ("copilot", "r1"),
-            "auto": ("concise", "turbo"),
-        }
-        payload_mode, model_preference = mode_mapping[mode]
+        try:
+            payload_mode, model_preference = MODE_MAPPING[mode]
+        except KeyError:
+            raise PerplexityError(f"Unknown mode: {mode}") from None
 
         # Build payload (plan lines 625-653)
         payload = {
@@ -266,7 +358,7 @@ class PerplexityClient:
             "params": {
                 "attachments": [],
                 "frontend_context_uuid": str(uuid4()),
-                "frontend_uuid": str(uuid4()),
+                "frontend_uuid": self._frontend_uuid,
                 "is_incognito": False,
                 "language": language,
                 "last_backend_uuid": follow_up,  # None or string UUID
@@ -278,12 +370,14 @@ class PerplexityClient:
             },
         }
 
+        body = _encode_payload(payload)
+
         # Make request with retry on transient errors
         last_error = None
         for attempt in range(MAX_RETRIES + 1):
             try:
                 response = self._request_with_retry(
-                    "POST", ENDPOINT_SSE_ASK, json=payload, stream=True
+                    "POST", ENDPOINT_SSE_ASK, stream=True, **body
                 )
                 parsed = self.parse_sse_response(response)
                 citations = self.extract_citations(parsed)
@@ -296,7 +390,7 @@ class PerplexityClient:
             except (PerplexityError, RateLimitError) as e:
                 last_error = e
                 if attempt < MAX_RETRIES:
-                    wait = 2 ** attempt * 2  # 2s, 4s backoff
+                    wait = 2**attempt * 2  # 2s, 4s backoff
                     logger.warning(
                         f"Attempt {attempt + 1}/{MAX_RETRIES + 1} failed: {e}. "
                         f"Retrying in {wait}s..."
@@ -5,9 +5,11 @@ This module contains all configurable constants used throughout the library.
 Modify these values to customize behavior without changing core code.
 """
 
+import functools
 import os
 from pathlib import Path
 from sqlite3 import OperationalError
+from types import MappingProxyType
 
 
 # API Configuration
@@ -25,29 +27,41 @@ COOKIE_MAX_AGE = 86400  # 24 hours
 # Retry configuration
 MAX_RETRIES = int(os.environ.get("PERPLEXITY_MAX_RETRIES", "2"))
 
-# HTTP Headers Template (exactly 20 headers)
-DEFAULT_HEADERS = {
-    "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",  # noqa: E501
-    "accept-language": "en-US,en;q=0.9",
-    "cache-control": "max-age=0",
-    "dnt": "1",
-    "priority": "u=0, i",
-    "sec-ch-ua": '"Not;A=Brand";v="24", "Chromium";v="128"',
-    "sec-ch-ua-arch": '"x86"',
-    "sec-ch-ua-bitness": '"64"',
-    "sec-ch-ua-full-version": '"128.0.6613.120"',
-    "sec-ch-ua-full-version-list": '"Not;A=Brand";v="24.0.0.0", "Chromium";v="128.0.6613.120"',  # noqa: E501
-    "sec-ch-ua-mobile": "?0",
-    "sec-ch-ua-model": '""',
-    "sec-ch-ua-platform": '"Windows"',
-    "sec-ch-ua-platform-version": '"19.0.0"',
-    "sec-fetch-dest": "document",
-    "sec-fetch-mode": "navigate",
-    "sec-fetch-site": "same-origin",
-    "sec-fetch-user": "?1",
-    "upgrade-insecure-requests": "1",
-    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36",  # noqa: E501
-}
+# Logical mode -> (payload mode, model preference), read-only
+MODE_MAPPING = MappingProxyType(
+    {
+        "deep research": ("copilot", "pplx_alpha"),
+        "pro": ("copilot", "pplx_pro"),
+        "reasoning": ("copilot", "r1"),
+        "auto": ("concise", "turbo"),
+    }
+)
+
+# HTTP Headers Template (exactly 20 headers, read-only)
+DEFAULT_HEADERS = MappingProxyType(
+    {
+        "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",  # noqa: E501
+        "accept-language": "en-US,en;q=0.9",
+        "cache-control": "max-age=0",
+        "dnt": "1",
+        "priority": "u=0, i",
+        "sec-ch-ua": '"Not;A=Brand";v="24", "Chromium";v="128"',
+        "sec-ch-ua-arch": '"x86"',
+        "sec-ch-ua-bitness": '"64"',
+        "sec-ch-ua-full-version": '"128.0.6613.120"',
+        "sec-ch-ua-full-version-list": '"Not;A=Brand";v="24.0.0.0", "Chromium";v="128.0.6613.120"',  # noqa: E501
+        "sec-ch-ua-mobile": "?0",
+        "sec-ch-ua-model": '""',
+        "sec-ch-ua-platform": '"Windows"',
+        "sec-ch-ua-platform-version": '"19.0.0"',
+        "sec-fetch-dest": "document",
+        "sec-fetch-mode": "navigate",
+        "sec-fetch-site": "same-origin",
+        "sec-fetch-user": "?1",
+        "upgrade-insecure-requests": "1",
+        "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36",  # noqa: E501
+    }
+)
 
 # Cookie Token Variants (in order of preference)
 SESSION_TOKEN_VARIANTS = [
@@ -62,6 +76,10 @@ CSRF_TOKEN_VARIANTS = [
     "__Host-next-auth.csrf-token",
 ]
 
+# Backoff (seconds) between cookie DB reads while Chrome holds the lock,
+# before asking to quit Chrome
+LOCK_RETRY_DELAYS = (0.05, 0.15, 0.3)
+
 # SQLite Lock Error Patterns
 LOCK_ERROR_PATTERNS = [
     "database is locked",
@@ -83,15 +101,41 @@ def get_cookies_file_path() -> Path:
     This ensures consistent location regardless of working directory.
     Critical for test isolation - pytest fixtures set env vars before calls.
 
+    Resolved paths are memoized per (env override, XDG_DATA_HOME, HOME), so
+    changing any of them still yields a freshly resolved path.
+
+    Returns:
+        Path: Resolved path to cookies.json file
+    """
+    return _resolve_cookies_file_path(
+        os.environ.get("PERPLEXITY_COOKIES_FILE"),
+        os.environ.get("XDG_DATA_HOME"),
+        os.environ.get("HOME"),
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_cookies_file_path(
+    env_path: str | None, xdg_data: str | None, home: str | None
+) -> Path:
+    """
+    Build the cookies.json path from already-read environment values.
+
+    Args:
+        env_path: PERPLEXITY_COOKIES_FILE value, if set
+        xdg_data: XDG_DATA_HOME value, if set
+        home: HOME value; only part of the cache key, Path.home() reads it
+
     Returns:
         Path: Resolved path to cookies.json file
     """
     # 1. Explicit env var override
-    if env_path := os.environ.get("PERPLEXITY_COOKIES_FILE"):
+    if env_path:
         return Path(env_path)
 
     # 2. XDG standard location (works for MCP stdio mode)
-    xdg_data = os.environ.get("XDG_DATA_HOME", str(Path.home() / ".local/share"))
+    if xdg_data is None:
+        xdg_data = str(Path.home() / ".local/share")
     return Path(xdg_data) / "perplexity-deep-research" / "cookies.json"
 
 
@@ -5,14 +5,23 @@ Provides functions to extract cookies from Chrome, normalize them to a canonical
 shape, persist them to disk, and retrieve them with caching and expiry detection.
 """
 
+import functools
 import json
 import os
+import shutil
+import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
 from sqlite3 import OperationalError
 
 from pycookiecheat import BrowserType, chrome_cookies
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used without it
+    orjson = None
+
 from .browser_control import (
     check_full_disk_access,
     ensure_chrome_accessible,
@@ -23,12 +32,46 @@ from .browser_control import (
 from .config import (
     COOKIE_MAX_AGE,
     CSRF_TOKEN_VARIANTS,
+    LOCK_RETRY_DELAYS,
     SESSION_TOKEN_VARIANTS,
     get_cookies_file_path,
     is_database_locked_error,
 )
 from .exceptions import CookieExtractionError
 
+# Last parsed cookies file: (path, mtime_ns, size, extracted_at, cookies)
+_cookie_cache: tuple[Path, int, int, float, dict] | None = None
+
+# (cookie name, canonical key) pairs, session variants first, each list in
+# order of preference
+_TOKEN_VARIANTS = tuple((v, "session_token") for v in SESSION_TOKEN_VARIANTS) + tuple(
+    (v, "csrf_token") for v in CSRF_TOKEN_VARIANTS
+)
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_dumps(data: dict) -> bytes:
+    """Serialize data to indented UTF-8 JSON, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+def _extracted_timestamp(value: float | str) -> float:
+    """
+    Convert a stored extracted_at value to a Unix timestamp.
+
+    Args:
+        value: Epoch seconds, or an ISO 8601 string from older cookie files
+
+    Returns:
+        float: Seconds since the epoch
+    """
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return value
+
 
 def get_chrome_cookie_path(profile: str = None) -> str:
     """
@@ -36,6 +79,7 @@ def get_chrome_cookie_path(profile: str = None) -> str:
 
     Resolves the absolute path to Chrome's Cookies SQLite database file.
     Uses CHROME_PROFILE env var or parameter (default: "Default").
+    Successful lookups are memoized per (profile, HOME); misses are not.
 
     Args:
         profile: Chrome profile name (e.g., "Default", "Profile 1")
@@ -46,8 +90,26 @@ def get_chrome_cookie_path(profile: str = None) -> str:
     Raises:
         CookieExtractionError: If Chrome cookie file not found
     """
-    base = Path.home() / "Library/Application Support/Google/Chrome"
     profile = os.environ.get("CHROME_PROFILE", profile or "Default")
+    return _resolve_chrome_cookie_path(profile, os.environ.get("HOME"))
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_chrome_cookie_path(profile: str, home: str | None) -> str:
+    """
+    Locate and resolve a profile's Cookies database.
+
+    Args:
+        profile: Effective Chrome profile name
+        home: HOME value; only part of the cache key, Path.home() reads it
+
+    Returns:
+        str: Absolute path to Chrome Cookies database file
+
+    Raises:
+        CookieExtractionError: If Chrome cookie file not found
+    """
+    base = Path.home() / "Library/Application Support/Google/Chrome"
     cookie_path = base / profile / "Cookies"
     if not cookie_path.exists():
         raise CookieExtractionError(f"Chrome cookie file not found: {cookie_path}")
@@ -70,37 +132,44 @@ def normalize_cookies(raw_cookies: dict) -> dict:
             - "session_token_name": Original cookie name (for HTTP)
             - "csrf_token": CSRF token value (optional)
             - "csrf_token_name": Original CSRF cookie name (optional)
+            - "_http": Prebuilt to_http_cookies() result
 
     Raises:
         CookieExtractionError: If no session token variant found
     """
     result = {}
 
-    # Find session token (required)
-    for variant in SESSION_TOKEN_VARIANTS:
-        if variant in raw_cookies:
-            result["session_token"] = raw_cookies[variant]
-            result["session_token_name"] = variant  # Preserve for HTTP!
-            break
+    # One pass over both variant lists in priority order; the first variant
+    # found per canonical key wins
+    for variant, key in _TOKEN_VARIANTS:
+        if key not in result and variant in raw_cookies:
+            result[key] = raw_cookies[variant]
+            result[f"{key}_name"] = variant  # Preserve for HTTP!
+            if len(result) == 4:  # Both tokens found
+                break
 
     if "session_token" not in result:
         raise CookieExtractionError("No session token found in Chrome cookies")
 
-    # Find CSRF token (optional)
-    for variant in CSRF_TOKEN_VARIANTS:
-        if variant in raw_cookies:
-            result["csrf_token"] = raw_cookies[variant]
-            result["csrf_token_name"] = variant
-            break
-
+    result["_http"] = _build_http_cookies(result)
     return result
 
 
+def _build_http_cookies(normalized: dict) -> dict:
+    """Build the HTTP cookie dict from canonical token fields."""
+    http_cookies = {normalized["session_token_name"]: normalized["session_token"]}
+    if "csrf_token" in normalized and "csrf_token_name" in normalized:
+        http_cookies[normalized["csrf_token_name"]] = normalized["csrf_token"]
+    return http_cookies
+
+
 def to_http_cookies(normalized: dict) -> dict:
     """
     Convert canonical shape back to HTTP cookie dict for curl_cffi.
 
     Uses the preserved original cookie names to reconstruct the HTTP format.
+    Returns the "_http" dict prebuilt by normalize_cookies() when present;
+    dicts without it (e.g. older cookies.json files) are rebuilt.
 
     Args:
         normalized: Canonical cookie dict from normalize_cookies()
@@ -109,19 +178,43 @@ def to_http_cookies(normalized: dict) -> dict:
         dict: HTTP cookie dict with original names as keys
             e.g., {"__Secure-next-auth.session-token": "eyJ...", ...}
     """
-    http_cookies = {}
-    http_cookies[normalized["session_token_name"]] = normalized["session_token"]
-    if "csrf_token" in normalized and "csrf_token_name" in normalized:
-        http_cookies[normalized["csrf_token_name"]] = normalized["csrf_token"]
+    http_cookies = normalized.get("_http")
+    if http_cookies is None:
+        http_cookies = _build_http_cookies(normalized)
     return http_cookies
 
 
+def _snapshot_cookie_db(cookie_path: str, dest_dir: str) -> str:
+    """
+    Copy Chrome's cookie database and its WAL/SHM siblings into dest_dir.
+
+    Reading a private copy avoids contending with the running Chrome for the
+    SQLite lock, and the copied WAL keeps cookies not yet checkpointed.
+
+    Args:
+        cookie_path: Path to Chrome's live Cookies database
+        dest_dir: Directory to place the copy in
+
+    Returns:
+        str: Path to the copied database
+    """
+    snapshot = os.path.join(dest_dir, "Cookies")
+    shutil.copyfile(cookie_path, snapshot)
+    for suffix in ("-wal", "-shm"):
+        try:
+            shutil.copyfile(cookie_path + suffix, snapshot + suffix)
+        except FileNotFoundError:
+            pass
+    return snapshot
+
+
 def extract_cookies_raw(password: str | None = None) -> dict:
     """
     Extract cookies from Chrome using pycookiecheat.
 
-    Low-level function that directly calls pycookiecheat.chrome_cookies().
-    May raise sqlite3.OperationalError if Chrome is locking the database.
+    Low-level function that calls pycookiecheat.chrome_cookies() on a temporary
+    copy of the Cookies database, so a running Chrome does not lock it.
+    May still raise sqlite3.OperationalError if the copy cannot be read.
 
     Args:
         password: Optional keychain password for decryption
@@ -133,12 +226,14 @@ def extract_cookies_raw(password: str | None = None) -> dict:
         sqlite3.OperationalError: If Chrome is blocking database access
         Other exceptions from pycookiecheat
     """
-    return chrome_cookies(
-        url="https://www.perplexity.ai",
-        browser=BrowserType.CHROME,
-        cookie_file=get_chrome_cookie_path(),
-        password=password,
-    )
+    cookie_path = get_chrome_cookie_path()
+    with tempfile.TemporaryDirectory(prefix="perplexity-cookies-") as tmp_dir:
+        return chrome_cookies(
+            url="https://www.perplexity.ai",
+            browser=BrowserType.CHROME,
+            cookie_file=_snapshot_cookie_db(cookie_path, tmp_dir),
+            password=password,
+        )
 
 
 def extract_cookies_with_relaunch() -> dict:
@@ -148,7 +243,7 @@ def extract_cookies_with_relaunch() -> dict:
     Handles:
     1. Full Disk Access permission errors
     2. Keychain password prompts
-    3. Chrome database locking
+    3. Chrome database locking (short backoff, then quit/relaunch)
 
     Returns:
         dict: Normalized cookie dict
@@ -163,9 +258,10 @@ def extract_cookies_with_relaunch() -> dict:
         )
 
     password = None
-    max_attempts = 2
+    prompted = False
+    lock_delays = iter(LOCK_RETRY_DELAYS)
 
-    for attempt in range(max_attempts):
+    while True:
         try:
             raw = extract_cookies_raw(password=password)
             return normalize_cookies(raw)
@@ -177,7 +273,8 @@ def extract_cookies_with_relaunch() -> dict:
                 or "password" in error_str
                 or "security" in error_str
             ):
-                if attempt == 0:
+                if not prompted:
+                    prompted = True
                     password = prompt_keychain_password()
                     if password is None:
                         raise CookieExtractionError(
@@ -190,7 +287,13 @@ def extract_cookies_with_relaunch() -> dict:
                     )
 
             if is_database_locked_error(e):
-                break
+                # Chrome often holds the lock only briefly; back off before
+                # escalating to the quit prompt
+                delay = next(lock_delays, None)
+                if delay is None:
+                    break
+                time.sleep(delay)
+                continue
 
             raise
 
@@ -213,7 +316,9 @@ def save_cookies(cookies: dict, path: Path | None = None) -> None:
     """
     Save cookies to JSON file.
 
-    Creates parent directory if needed (mkdir -p behavior).
+    Creates parent directory if needed (mkdir -p behavior). The file is written
+    to a sibling temp file and swapped in with os.replace(), so concurrent
+    readers see either the old or the new contents, never a partial write.
 
     Args:
         cookies: Canonical cookie dict to save
@@ -222,8 +327,17 @@ def save_cookies(cookies: dict, path: Path | None = None) -> None:
     path = path or get_cookies_file_path()
     path.parent.mkdir(parents=True, exist_ok=True)  # mkdir -p
 
-    data = {"cookies": cookies, "extracted_at": datetime.now().isoformat()}
-    path.write_text(json.dumps(data, indent=2))
+    global _cookie_cache
+    data = {"cookies": cookies, "extracted_at": time.time()}
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_json_dumps(data))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    _cookie_cache = None
 
 
 def load_cookies(path: Path | None = None) -> dict | None:
@@ -231,6 +345,8 @@ def load_cookies(path: Path | None = None) -> dict | None:
     Load cookies from JSON file.
 
     Returns None if file missing or cookies have expired (age > COOKIE_MAX_AGE).
+    The parsed file is cached until its mtime or size changes, so repeated
+    calls cost a single stat; a cache miss opens and reads the file once.
 
     Args:
         path: Path to cookies file (default: from get_cookies_file_path())
@@ -238,19 +354,36 @@ def load_cookies(path: Path | None = None) -> dict | None:
     Returns:
         dict: Canonical cookie dict if valid, None if missing or expired
     """
+    global _cookie_cache
     path = path or get_cookies_file_path()
 
-    if not path.exists():
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
         return None
 
-    data = json.loads(path.read_text())
-    extracted_at = datetime.fromisoformat(data["extracted_at"])
-    age = (datetime.now() - extracted_at).total_seconds()
+    cache = _cookie_cache
+    if cache is not None and cache[:3] == (path, st.st_mtime_ns, st.st_size):
+        extracted_at, cookies = cache[3], cache[4]
+    else:
+        # Key the cache on the descriptor we read from, so a rewrite between
+        # the stat above and this read can't pair new bytes with an old key
+        try:
+            with open(path, "rb") as f:
+                st = os.fstat(f.fileno())
+                data = _json_loads(f.read())
+        except FileNotFoundError:
+            return None
+        extracted_at = _extracted_timestamp(data["extracted_at"])
+        cookies = data["cookies"]
+        _cookie_cache = (path, st.st_mtime_ns, st.st_size, extracted_at, cookies)
+
+    age = time.time() - extracted_at
 
     if age > COOKIE_MAX_AGE:
         return None
 
-    return data["cookies"]
+    return cookies
 
 
 def get_cookies() -> dict:
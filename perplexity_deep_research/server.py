@@ -1,27 +1,80 @@
 """MCP server for Perplexity Deep Research with 5 tools."""
 
+import logging
+import sys
+import threading
+from collections.abc import Sequence
+
 from mcp.server.fastmcp import FastMCP
 
 from .client import PerplexityClient
+from .cookies import load_cookies
+from .exceptions import PerplexityError
 
 # Initialize FastMCP server
 mcp = FastMCP("Perplexity Deep Research")
 
-# Lazy singleton for client
+logger = logging.getLogger("perplexity-deep-research")
+
+# Lazy singleton for client; the lock keeps concurrent first calls from each
+# extracting cookies and building a session
 _client: PerplexityClient | None = None
+_client_lock = threading.Lock()
 
 
 def get_client() -> PerplexityClient:
-    """Get or create PerplexityClient singleton."""
+    """Get or create PerplexityClient singleton (thread-safe)."""
     global _client
     if _client is None:
-        _client = PerplexityClient()
+        with _client_lock:
+            if _client is None:
+                _client = PerplexityClient()
     return _client
 
 
+# Immutable default shared by every tool signature
+_DEFAULT_SOURCES = ("web",)
+
+
+def _invoke(
+    mode: str,
+    query: str,
+    sources: Sequence[str] = _DEFAULT_SOURCES,
+    language: str = "en-US",
+    follow_up: str | None = None,
+) -> dict:
+    """
+    Run a search through the shared client, reporting failures as data.
+
+    Only PerplexityError (cookies, auth, rate limits, API errors) becomes an
+    error dict; anything else is a bug and propagates so FastMCP logs it.
+
+    Args:
+        mode: Logical mode passed to PerplexityClient.search()
+        query: The user's question
+        sources: Sources to search
+        language: Language code
+        follow_up: Optional backend_uuid to continue a conversation
+
+    Returns:
+        dict: Response with 'answer', 'citations', 'backend_uuid' keys
+              OR {'error': str} on failure
+    """
+    try:
+        return get_client().search(
+            query=query,
+            mode=mode,
+            sources=list(sources),
+            language=language,
+            follow_up=follow_up,
+        )
+    except PerplexityError as e:
+        return {"error": str(e)}
+
+
 @mcp.tool()
 def deep_research(
-    query: str, sources: list[str] = ["web"], language: str = "en-US"
+    query: str, sources: Sequence[str] = _DEFAULT_SOURCES, language: str = "en-US"
 ) -> dict:
     """
     Perform exhaustive multi-step research on a query.
@@ -38,21 +91,13 @@ def deep_research(
         dict: Response with 'answer', 'citations', 'backend_uuid' keys
               OR {'error': str} on failure
     """
-    try:
-        client = get_client()
-        return client.search(
-            query=query,
-            mode="deep research",
-            sources=sources,
-            language=language,
-            follow_up=None,
-        )
-    except Exception as e:
-        return {"error": str(e)}
+    return _invoke("deep research", query, sources, language)
 
 
 @mcp.tool()
-def ask(query: str, sources: list[str] = ["web"], language: str = "en-US") -> dict:
+def ask(
+    query: str, sources: Sequence[str] = _DEFAULT_SOURCES, language: str = "en-US"
+) -> dict:
     """
     Ask a question using Perplexity Pro mode.
 
@@ -67,17 +112,13 @@ def ask(query: str, sources: list[str] = ["web"], language: str = "en-US") -> di
         dict: Response with 'answer', 'citations', 'backend_uuid' keys
               OR {'error': str} on failure
     """
-    try:
-        client = get_client()
-        return client.search(
-            query=query, mode="pro", sources=sources, language=language, follow_up=None
-        )
-    except Exception as e:
-        return {"error": str(e)}
+    return _invoke("pro", query, sources, language)
 
 
 @mcp.tool()
-def reason(query: str, sources: list[str] = ["web"], language: str = "en-US") -> dict:
+def reason(
+    query: str, sources: Sequence[str] = _DEFAULT_SOURCES, language: str = "en-US"
+) -> dict:
     """
     Reasoning-focused analysis for questions requiring step-by-step thinking.
 
@@ -94,21 +135,13 @@ def reason(query: str, sources: list[str] = ["web"], language: str = "en-US") ->
         dict: Response with 'answer', 'citations', 'backend_uuid' keys
               OR {'error': str} on failure
     """
-    try:
-        client = get_client()
-        return client.search(
-            query=query,
-            mode="reasoning",
-            sources=sources,
-            language=language,
-            follow_up=None,
-        )
-    except Exception as e:
-        return {"error": str(e)}
+    return _invoke("reasoning", query, sources, language)
 
 
 @mcp.tool()
-def search(query: str, sources: list[str] = ["web"], language: str = "en-US") -> dict:
+def search(
+    query: str, sources: Sequence[str] = _DEFAULT_SOURCES, language: str = "en-US"
+) -> dict:
     """
     Perform a quick basic search.
 
@@ -123,13 +156,7 @@ def search(query: str, sources: list[str] = ["web"], language: str = "en-US") ->
         dict: Response with 'answer', 'citations', 'backend_uuid' keys
               OR {'error': str} on failure
     """
-    try:
-        client = get_client()
-        return client.search(
-            query=query, mode="auto", sources=sources, language=language, follow_up=None
-        )
-    except Exception as e:
-        return {"error": str(e)}
+    return _invoke("auto", query, sources, language)
 
 
 @mcp.tool()
@@ -148,21 +175,36 @@ def follow_up(query: str, backend_uuid: str) -> dict:
         dict: Response with 'answer', 'citations', 'backend_uuid' keys
               OR {'error': str} on failure
     """
+    return _invoke("auto", query, follow_up=backend_uuid)
+
+
+def _warm_client() -> None:
+    """Build the client singleton from cached cookies, logging on failure.
+
+    Skipped without valid cached cookies: extraction can open macOS dialogs
+    or quit Chrome. A corrupt cookies file is logged like any other failure.
+    """
     try:
-        client = get_client()
-        return client.search(
-            query=query,
-            mode="auto",
-            sources=["web"],
-            language="en-US",
-            follow_up=backend_uuid,
-        )
+        if load_cookies() is None:
+            return
+        get_client()
     except Exception as e:
-        return {"error": str(e)}
+        logger.warning(f"Client initialization deferred: {e}")
 
 
 def main():
     """Run the MCP server."""
+    # Configure logging here, not on import, so library users keep their own
+    # root logger setup. stderr keeps stdout free for the stdio transport.
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        stream=sys.stderr,
+    )
+    # Warm the client so the first tool call skips the session bootstrap. It
+    # runs beside the transport so the MCP handshake never waits; on failure
+    # the tools retry lazily and report the error themselves.
+    threading.Thread(target=_warm_client, name="client-warmup", daemon=True).start()
     mcp.run()
 
 
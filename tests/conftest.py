@@ -0,0 +1,115 @@
+"""
+Shared pytest fixtures.
+
+The client patch bag lives here so every module that builds a real
+PerplexityClient stubs the same dependencies the same way; the tool-level
+tests share one reusable client mock the same way.
+"""
+
+from contextlib import ExitStack
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import DEFAULT, Mock, patch
+
+import pytest
+
+from perplexity_deep_research.client import PerplexityClient
+
+# What mock_client.search returns by default. Shared by reference across
+# tests, hence read-only; build a new dict to vary it.
+_SEARCH_RESULT = MappingProxyType(
+    {
+        "answer": "Test answer",
+        "citations": ["https://example.com"],
+        "backend_uuid": "test-uuid",
+    }
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_client_singleton(monkeypatch):
+    """Start every test without a cached server client, restored afterwards."""
+    from perplexity_deep_research import server
+
+    monkeypatch.setattr(server, "_client", None)
+
+
+@pytest.fixture
+def mock_cookies():
+    """Return test cookies with session_token_name."""
+    return {
+        "session_token": "test-session-token",
+        "session_token_name": "__Secure-next-auth.session-token",
+        "csrf_token": "test-csrf-token",
+        "csrf_token_name": "__Secure-next-auth.csrf-token",
+    }
+
+
+@pytest.fixture(scope="class")
+def patched_session():
+    """Install the requests.Session patch once per test class.
+
+    client_patches resets it before every test, so no state leaks between
+    tests that share the class-wide mock. ``spec=True`` limits the class and
+    its instances to real Session attributes, so typos fail loudly.
+    """
+    with patch(
+        "perplexity_deep_research.client.requests.Session", spec=True
+    ) as session_cls:
+        yield session_cls
+
+
+@pytest.fixture
+def client_patches(mock_cookies, monkeypatch, patched_session):
+    """Patch the client's cookie, session and sleep dependencies in one stack.
+
+    Yields a namespace with the Session class mock (``session_cls``), the
+    session instance every client gets (``session``) and the other mocks.
+    ``time.sleep`` is a plain no-op; tests that assert on it patch it locally.
+    """
+    target = "perplexity_deep_research.client"
+    # Reset the specced instance in place rather than with return_value=True
+    # on the class, which would swap it for an unspecced MagicMock.
+    patched_session.reset_mock(side_effect=True)
+    patched_session.return_value.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr(f"{target}.time.sleep", lambda *_: None)
+    with ExitStack() as stack:
+        mocks = stack.enter_context(
+            patch.multiple(
+                target,
+                get_cookies=DEFAULT,
+                to_http_cookies=DEFAULT,
+                extract_cookies_with_relaunch=DEFAULT,
+                save_cookies=DEFAULT,
+            )
+        )
+        mocks["get_cookies"].return_value = mock_cookies
+        mocks["to_http_cookies"].return_value = {"test": "cookie"}
+        mocks["extract_cookies_with_relaunch"].return_value = mock_cookies
+        yield SimpleNamespace(
+            get_cookies=mocks["get_cookies"],
+            to_http_cookies=mocks["to_http_cookies"],
+            extract_cookies=mocks["extract_cookies_with_relaunch"],
+            save_cookies=mocks["save_cookies"],
+            session_cls=patched_session,
+            session=patched_session.return_value,
+        )
+
+
+@pytest.fixture(scope="session")
+def shared_mock_client():
+    """Return the one client mock reused by tool-level tests.
+
+    Specced on PerplexityClient so tool code can't call methods it lacks.
+    """
+    return Mock(spec=PerplexityClient)
+
+
+@pytest.fixture
+def mock_client(shared_mock_client, monkeypatch):
+    """Reset the shared client mock and install it behind server.get_client()."""
+    shared_mock_client.reset_mock(return_value=True, side_effect=True)
+    shared_mock_client.search.return_value = _SEARCH_RESULT
+    monkeypatch.setattr(
+        "perplexity_deep_research.server.get_client", lambda: shared_mock_client
+    )
+    return shared_mock_client
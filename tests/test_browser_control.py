@@ -1,12 +1,19 @@
 """Tests for browser_control module."""
 
+import select
 import subprocess
+import sys
+import time
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from perplexity_deep_research import browser_control
 from perplexity_deep_research.browser_control import (
     ChromeAccessResult,
+    _OsascriptBridge,
+    _run_osascript,
     check_full_disk_access,
     ensure_chrome_accessible,
     is_chrome_running,
@@ -17,11 +24,185 @@ from perplexity_deep_research.browser_control import (
     show_full_disk_access_dialog,
 )
 
+# Stand-in for `osascript -i`: echoes each input line back as a result.
+FAKE_OSASCRIPT = (
+    sys.executable,
+    "-c",
+    "import sys\nfor line in sys.stdin:\n    print('>> => ' + line.strip(), flush=True)",
+)
+
+
+@pytest.fixture(autouse=True)
+def no_osascript_bridge(monkeypatch):
+    """Route AppleScript through subprocess.run so tests can mock it."""
+
+    def _unavailable():
+        raise FileNotFoundError("osascript")
+
+    monkeypatch.setattr(browser_control, "_OsascriptBridge", _unavailable)
+    monkeypatch.setattr(browser_control, "_bridge", None)
+    monkeypatch.setattr(browser_control, "_bridge_disabled", False)
+
+
+@pytest.fixture(autouse=True)
+def reset_chrome_running_cache(monkeypatch):
+    """Start every test without a cached is_chrome_running() result."""
+    monkeypatch.setattr(browser_control, "_chrome_running_cache", None)
+
+
+@pytest.fixture(autouse=True)
+def pgrep_available(monkeypatch):
+    """Assume pgrep is on PATH regardless of the host running the tests."""
+    monkeypatch.setattr(browser_control, "_has_pgrep", lambda: True)
+
+
+@pytest.fixture
+def no_kqueue(monkeypatch):
+    """Pin quit_chrome() to its polling path, even on macOS where kqueue exists.
+
+    Without kqueue, quit_chrome() skips the _get_chrome_pid() lookup, so the
+    first subprocess.run side effect is the quit script itself.
+    """
+    monkeypatch.setattr(
+        browser_control, "select", SimpleNamespace(select=select.select)
+    )
+
+
+@pytest.fixture
+def fake_clock():
+    """Patch time.sleep/time.monotonic with a clock that advances on sleep.
+
+    Returns the list of requested sleep durations.
+    """
+    now = 0.0
+    sleeps: list[float] = []
+
+    def _sleep(seconds: float) -> None:
+        nonlocal now
+        sleeps.append(seconds)
+        now += seconds
+
+    with (
+        patch("time.sleep", side_effect=_sleep),
+        patch("time.monotonic", side_effect=lambda: now),
+    ):
+        yield sleeps
+
+
+class TestOsascriptBridge:
+    def test_bridge_returns_last_result(self) -> None:
+        bridge = _OsascriptBridge(FAKE_OSASCRIPT)
+        try:
+            assert bridge.run("true", timeout=5) == "true"
+            assert bridge.run("false", timeout=5) == "false"
+        finally:
+            bridge.close()
+
+        assert not bridge.alive()
+
+    def test_bridge_raises_oserror_when_script_cannot_be_sent(self) -> None:
+        bridge = _OsascriptBridge((sys.executable, "-c", "pass"))
+        bridge._proc.wait()
+        try:
+            with pytest.raises(OSError):
+                bridge.run("true", timeout=5)
+        finally:
+            bridge.close()
+
+    def test_bridge_raises_when_process_exits_after_send(self) -> None:
+        bridge = _OsascriptBridge(
+            (sys.executable, "-c", "import sys; sys.stdin.readline()")
+        )
+        try:
+            with pytest.raises(subprocess.SubprocessError):
+                bridge.run("true", timeout=5)
+        finally:
+            bridge.close()
+
+    def test_run_osascript_uses_bridge(self, monkeypatch) -> None:
+        monkeypatch.setattr(
+            browser_control,
+            "_OsascriptBridge",
+            lambda: _OsascriptBridge(FAKE_OSASCRIPT),
+        )
+
+        try:
+            with patch("subprocess.run") as mock_run:
+                first = _run_osascript("true", timeout=5)
+                bridge = browser_control._bridge
+                second = _run_osascript("false", timeout=5)
+
+            assert first.stdout == "true"
+            assert second.stdout == "false"
+            assert browser_control._bridge is bridge
+            mock_run.assert_not_called()
+        finally:
+            browser_control._close_bridge()
+
+    def test_run_osascript_disables_bridge_that_fails_probe(self, monkeypatch) -> None:
+        # Never answers, like an osascript -i that buffers its output on a pipe
+        silent = (sys.executable, "-c", "import sys; sys.stdin.read()")
+        spawn = MagicMock(side_effect=lambda: _OsascriptBridge(silent))
+        monkeypatch.setattr(browser_control, "_OsascriptBridge", spawn)
+        monkeypatch.setattr(browser_control, "_BRIDGE_PROBE_TIMEOUT", 0.1)
+        mock_result = MagicMock()
+        mock_result.stdout = "true\n"
+
+        with patch("subprocess.run", return_value=mock_result) as mock_run:
+            first = _run_osascript("true", timeout=5)
+            second = _run_osascript("false", timeout=5)
+
+        assert first is second is mock_result
+        assert [c[0][0] for c in mock_run.call_args_list] == [
+            ["osascript", "-e", "true"],
+            ["osascript", "-e", "false"],
+        ]
+        spawn.assert_called_once()  # Not respawned once disabled
+        assert browser_control._bridge is None
+
+    def test_run_osascript_never_resends_after_timeout(self, monkeypatch) -> None:
+        # Answers the probe, then goes silent on the real script
+        answers_probe = (
+            sys.executable,
+            "-c",
+            (
+                "import sys\n"
+                "for i, line in enumerate(sys.stdin):\n"
+                "    if i < 2:\n"
+                "        print('>> => ' + line.strip(), flush=True)"
+            ),
+        )
+        monkeypatch.setattr(
+            browser_control,
+            "_OsascriptBridge",
+            lambda: _OsascriptBridge(answers_probe),
+        )
+
+        with (
+            patch("subprocess.run") as mock_run,
+            pytest.raises(subprocess.TimeoutExpired),
+        ):
+            _run_osascript('tell application "Google Chrome" to quit', 0.2)
+
+        mock_run.assert_not_called()
+        assert browser_control._bridge is None
+        assert browser_control._bridge_disabled
+
+    def test_run_osascript_falls_back_to_subprocess(self) -> None:
+        mock_result = MagicMock()
+        mock_result.stdout = "true\n"
+
+        with patch("subprocess.run", return_value=mock_result) as mock_run:
+            result = _run_osascript("true", timeout=5)
+
+        assert result is mock_result
+        assert mock_run.call_args[0][0] == ["osascript", "-e", "true"]
+
 
 class TestIsChromeRunning:
     def test_is_chrome_running_true(self) -> None:
         mock_result = MagicMock()
-        mock_result.stdout = "true\n"
+        mock_result.returncode = 0
 
         with patch("subprocess.run", return_value=mock_result) as mock_run:
             result = is_chrome_running()
@@ -29,13 +210,36 @@ class TestIsChromeRunning:
         assert result is True
         mock_run.assert_called_once()
         call_args = mock_run.call_args
-        assert call_args[0][0] == [
+        assert call_args[0][0] == ["pgrep", "-x", "Google Chrome"]
+
+    def test_is_chrome_running_false(self) -> None:
+        mock_result = MagicMock()
+        mock_result.returncode = 1
+
+        with patch("subprocess.run", return_value=mock_result) as mock_run:
+            result = is_chrome_running()
+
+        assert result is False
+        mock_run.assert_called_once()
+
+    def test_is_chrome_running_falls_back_without_pgrep(self) -> None:
+        mock_result = MagicMock()
+        mock_result.stdout = "true\n"
+
+        with patch(
+            "subprocess.run", side_effect=[FileNotFoundError("pgrep"), mock_result]
+        ) as mock_run:
+            result = is_chrome_running()
+
+        assert result is True
+        assert mock_run.call_args[0][0] == [
             "osascript",
             "-e",
             'tell application "System Events" to (name of processes) contains "Google Chrome"',
         ]
 
-    def test_is_chrome_running_false(self) -> None:
+    def test_is_chrome_running_skips_missing_pgrep(self, monkeypatch) -> None:
+        monkeypatch.setattr(browser_control, "_has_pgrep", lambda: False)
         mock_result = MagicMock()
         mock_result.stdout = "false\n"
 
@@ -44,11 +248,10 @@ class TestIsChromeRunning:
 
         assert result is False
         mock_run.assert_called_once()
+        assert mock_run.call_args[0][0][0] == "osascript"
 
     def test_is_chrome_running_timeout(self) -> None:
-        with patch(
-            "subprocess.run", side_effect=subprocess.TimeoutExpired("osascript", 5)
-        ):
+        with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("pgrep", 2)):
             result = is_chrome_running()
 
         assert result is False
@@ -59,9 +262,35 @@ class TestIsChromeRunning:
 
         assert result is False
 
+    def test_is_chrome_running_cached_within_ttl(self) -> None:
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+
+        with patch("subprocess.run", return_value=mock_result) as mock_run:
+            assert is_chrome_running() is True
+            assert is_chrome_running() is True
+
+        mock_run.assert_called_once()
+
+    def test_is_chrome_running_requeries_after_ttl(self, fake_clock) -> None:
+        mock_running = MagicMock()
+        mock_running.returncode = 0
+
+        mock_stopped = MagicMock()
+        mock_stopped.returncode = 1
+
+        with patch(
+            "subprocess.run", side_effect=[mock_running, mock_stopped]
+        ) as mock_run:
+            assert is_chrome_running() is True
+            time.sleep(0.25)
+            assert is_chrome_running() is False
+
+        assert mock_run.call_count == 2
+
 
 class TestQuitChrome:
-    def test_quit_chrome_waits(self) -> None:
+    def test_quit_chrome_waits(self, no_kqueue) -> None:
         mock_result = MagicMock()
         mock_result.stdout = ""
         call_count = 0
@@ -72,7 +301,7 @@ class TestQuitChrome:
             if call_count == 1:
                 return mock_result
             mock_check = MagicMock()
-            mock_check.stdout = "false\n" if call_count >= 3 else "true\n"
+            mock_check.returncode = 1 if call_count >= 3 else 0
             return mock_check
 
         with patch("subprocess.run", side_effect=mock_run_side_effect):
@@ -82,18 +311,113 @@ class TestQuitChrome:
         assert result is True
         assert mock_sleep.call_count >= 1
 
-    def test_quit_chrome_timeout(self) -> None:
+    def test_quit_chrome_timeout(self, fake_clock, no_kqueue) -> None:
         mock_result = MagicMock()
         mock_result.stdout = ""
 
         mock_check = MagicMock()
-        mock_check.stdout = "true\n"
+        mock_check.returncode = 0
 
         with patch("subprocess.run", side_effect=[mock_result] + [mock_check] * 25):
-            with patch("time.sleep"):
+            result = quit_chrome()
+
+        assert result is False
+        assert sum(fake_clock) == pytest.approx(10.0)
+
+    def test_quit_chrome_polls_with_backoff(self, fake_clock, no_kqueue) -> None:
+        mock_result = MagicMock()
+        mock_result.stdout = ""
+
+        mock_running = MagicMock()
+        mock_running.returncode = 0
+
+        mock_stopped = MagicMock()
+        mock_stopped.returncode = 1
+
+        with patch(
+            "subprocess.run",
+            side_effect=[mock_result] + [mock_running] * 3 + [mock_stopped],
+        ):
+            result = quit_chrome()
+
+        assert result is True
+        assert fake_clock == pytest.approx([0.1, 0.15, 0.225, 0.3375])
+
+    def test_quit_chrome_kqueue_exit(self) -> None:
+        mock_pgrep = MagicMock()
+        mock_pgrep.returncode = 0
+        mock_pgrep.stdout = "1234\n"
+
+        mock_quit = MagicMock()
+        mock_quit.stdout = ""
+
+        with patch("perplexity_deep_research.browser_control.select") as mock_select:
+            mock_kq = mock_select.kqueue.return_value
+            mock_kq.control.side_effect = [[], [MagicMock()]]
+            with patch(
+                "subprocess.run", side_effect=[mock_pgrep, mock_quit]
+            ) as mock_run:
+                with patch("time.sleep") as mock_sleep:
+                    result = quit_chrome()
+
+        assert result is True
+        assert mock_run.call_args_list[0][0][0] == ["pgrep", "-x", "Google Chrome"]
+        mock_select.kevent.assert_called_once()
+        assert mock_select.kevent.call_args[0][0] == 1234
+        mock_kq.close.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    def test_quit_chrome_kqueue_timeout(self) -> None:
+        mock_pgrep = MagicMock()
+        mock_pgrep.returncode = 0
+        mock_pgrep.stdout = "1234\n"
+
+        mock_quit = MagicMock()
+        mock_quit.stdout = ""
+
+        with patch("perplexity_deep_research.browser_control.select") as mock_select:
+            mock_kq = mock_select.kqueue.return_value
+            mock_kq.control.side_effect = [[], []]
+            with patch("subprocess.run", side_effect=[mock_pgrep, mock_quit]):
                 result = quit_chrome()
 
         assert result is False
+        mock_kq.close.assert_called_once()
+
+    def test_quit_chrome_kqueue_esrch_falls_back_to_polling(self) -> None:
+        mock_pgrep = MagicMock()
+        mock_pgrep.returncode = 0
+        mock_pgrep.stdout = "1234\n"
+
+        mock_quit = MagicMock()
+        mock_quit.stdout = ""
+
+        mock_check = MagicMock()
+        mock_check.returncode = 1
+
+        with patch("perplexity_deep_research.browser_control.select") as mock_select:
+            mock_select.kqueue.return_value.control.side_effect = ProcessLookupError()
+            with patch(
+                "subprocess.run", side_effect=[mock_pgrep, mock_quit, mock_check]
+            ):
+                with patch("time.sleep") as mock_sleep:
+                    result = quit_chrome()
+
+        assert result is True
+        assert mock_sleep.call_count == 1
+
+    def test_quit_chrome_uses_given_pid(self) -> None:
+        mock_quit = MagicMock()
+        mock_quit.stdout = ""
+
+        with patch("perplexity_deep_research.browser_control.select") as mock_select:
+            mock_select.kqueue.return_value.control.side_effect = [[], [MagicMock()]]
+            with patch("subprocess.run", return_value=mock_quit) as mock_run:
+                result = quit_chrome(4321)
+
+        assert result is True
+        mock_run.assert_called_once()
+        assert mock_select.kevent.call_args[0][0] == 4321
 
 
 class TestPromptCloseChrome:
@@ -158,7 +482,7 @@ class TestRelaunchChrome:
         mock_result.stdout = ""
 
         mock_check = MagicMock()
-        mock_check.stdout = "true\n"
+        mock_check.returncode = 0
 
         with patch("subprocess.run", side_effect=[mock_result, mock_check]):
             with patch("time.sleep"):
@@ -166,18 +490,18 @@ class TestRelaunchChrome:
 
         assert result is True
 
-    def test_relaunch_chrome_failure(self) -> None:
+    def test_relaunch_chrome_failure(self, fake_clock) -> None:
         mock_result = MagicMock()
         mock_result.stdout = ""
 
         mock_check = MagicMock()
-        mock_check.stdout = "false\n"
+        mock_check.returncode = 1
 
-        with patch("subprocess.run", side_effect=[mock_result, mock_check]):
-            with patch("time.sleep"):
-                result = relaunch_chrome()
+        with patch("subprocess.run", side_effect=[mock_result] + [mock_check] * 10):
+            result = relaunch_chrome()
 
         assert result is False
+        assert sum(fake_clock) == pytest.approx(3.0)
 
     def test_relaunch_chrome_subprocess_error(self) -> None:
         with patch("subprocess.run", side_effect=subprocess.SubprocessError("error")):
@@ -189,7 +513,7 @@ class TestRelaunchChrome:
 class TestEnsureChromeAccessible:
     def test_ensure_chrome_accessible_returns_result(self) -> None:
         mock_result = MagicMock()
-        mock_result.stdout = "false\n"
+        mock_result.returncode = 1
 
         with patch("subprocess.run", return_value=mock_result):
             result = ensure_chrome_accessible()
@@ -201,7 +525,7 @@ class TestEnsureChromeAccessible:
 
     def test_ensure_chrome_accessible_not_running(self) -> None:
         mock_result = MagicMock()
-        mock_result.stdout = "false\n"
+        mock_result.returncode = 1
 
         with patch("subprocess.run", return_value=mock_result):
             result = ensure_chrome_accessible()
@@ -218,11 +542,11 @@ class TestEnsureChromeAccessible:
             call_count += 1
             mock = MagicMock()
             if call_count == 1:
-                mock.stdout = "true\n"
+                mock.returncode = 0
             elif call_count == 2:
                 mock.stdout = ""
             else:
-                mock.stdout = "false\n"
+                mock.returncode = 1
             return mock
 
         with patch("subprocess.run", side_effect=mock_run_side_effect):
@@ -238,7 +562,7 @@ class TestEnsureChromeAccessible:
 
     def test_ensure_chrome_accessible_user_declines(self) -> None:
         mock_result = MagicMock()
-        mock_result.stdout = "true\n"
+        mock_result.returncode = 0
 
         with patch("subprocess.run", return_value=mock_result):
             with patch("sys.stdin.isatty", return_value=True):
@@ -252,7 +576,7 @@ class TestEnsureChromeAccessible:
 
     def test_ensure_chrome_accessible_non_interactive(self) -> None:
         mock_result = MagicMock()
-        mock_result.stdout = "true\n"
+        mock_result.returncode = 0
 
         with patch("subprocess.run", return_value=mock_result):
             with patch("sys.stdin.isatty", return_value=False):
@@ -262,6 +586,42 @@ class TestEnsureChromeAccessible:
             was_running=True, was_quit=False, accessible=False
         )
 
+    def test_ensure_chrome_accessible_prefetches_pid(self) -> None:
+        bc = "perplexity_deep_research.browser_control"
+        with patch(f"{bc}.select") as mock_select:
+            mock_select.kqueue = MagicMock()
+            with (
+                patch(f"{bc}.is_chrome_running", return_value=True),
+                patch(f"{bc}._get_chrome_pid", return_value=1234) as mock_pid,
+                patch(f"{bc}.prompt_close_chrome", return_value=True),
+                patch(f"{bc}.quit_chrome", return_value=True) as mock_quit,
+            ):
+                result = ensure_chrome_accessible()
+
+        assert result == ChromeAccessResult(
+            was_running=True, was_quit=True, accessible=True
+        )
+        mock_pid.assert_called_once_with()
+        mock_quit.assert_called_once_with(1234)
+
+    def test_ensure_chrome_accessible_no_prefetch_without_pgrep(
+        self, monkeypatch
+    ) -> None:
+        monkeypatch.setattr(browser_control, "_has_pgrep", lambda: False)
+        bc = "perplexity_deep_research.browser_control"
+        with patch(f"{bc}.select") as mock_select:
+            mock_select.kqueue = MagicMock()
+            with (
+                patch(f"{bc}.is_chrome_running", return_value=True),
+                patch(f"{bc}._get_chrome_pid") as mock_pid,
+                patch(f"{bc}.prompt_close_chrome", return_value=True),
+                patch(f"{bc}.quit_chrome", return_value=True) as mock_quit,
+            ):
+                ensure_chrome_accessible()
+
+        mock_pid.assert_not_called()
+        mock_quit.assert_called_once_with(None)
+
 
 class TestChromeAccessResult:
     def test_dataclass_fields(self) -> None:
@@ -314,31 +674,73 @@ class TestPromptKeychainPassword:
         assert result is None
 
 
+@pytest.fixture
+def chrome_home(tmp_path):
+    """Point Path.home() at tmp_path and return the Chrome cookie file path."""
+    cookie_file = tmp_path / "Library/Application Support/Google/Chrome/Default/Cookies"
+    with patch(
+        "perplexity_deep_research.browser_control.Path.home",
+        return_value=tmp_path,
+    ):
+        yield cookie_file
+
+
 class TestCheckFullDiskAccess:
-    def test_check_full_disk_access_has_access(self, tmp_path) -> None:
-        cookie_file = tmp_path / "Cookies"
-        cookie_file.write_bytes(b"test")
+    @pytest.fixture(autouse=True)
+    def clear_cache(self, monkeypatch):
+        monkeypatch.setattr(browser_control, "_full_disk_access_granted", False)
 
-        with patch(
-            "perplexity_deep_research.browser_control.Path.home",
-            return_value=tmp_path,
-        ):
-            with patch("builtins.open", MagicMock()):
-                result = check_full_disk_access()
+    def test_check_full_disk_access_has_access(self, chrome_home) -> None:
+        chrome_home.parent.mkdir(parents=True)
+        chrome_home.write_bytes(b"test")
+
+        result = check_full_disk_access()
 
         assert result is True
 
-    def test_check_full_disk_access_permission_denied(self) -> None:
+    def test_check_full_disk_access_permission_denied(self, chrome_home) -> None:
+        chrome_home.parent.mkdir(parents=True)
+        chrome_home.write_bytes(b"test")
+
         with patch("builtins.open", side_effect=PermissionError("access denied")):
             result = check_full_disk_access()
 
         assert result is False
 
-    def test_check_full_disk_access_file_not_found(self) -> None:
-        with patch("builtins.open", side_effect=FileNotFoundError("not found")):
+    def test_check_full_disk_access_unreadable_skips_open(self, chrome_home) -> None:
+        chrome_home.parent.mkdir(parents=True)
+        chrome_home.write_bytes(b"test")
+
+        with patch("os.access", return_value=False):
+            with patch("builtins.open") as mock_open:
+                result = check_full_disk_access()
+
+        assert result is False
+        mock_open.assert_not_called()
+
+    def test_check_full_disk_access_file_not_found(self, chrome_home) -> None:
+        with patch("builtins.open") as mock_open:
             result = check_full_disk_access()
 
         assert result is True
+        mock_open.assert_not_called()
+
+    def test_check_full_disk_access_cached(self, chrome_home) -> None:
+        with patch("os.stat", side_effect=FileNotFoundError()) as mock_stat:
+            assert check_full_disk_access() is True
+            assert check_full_disk_access() is True
+
+        mock_stat.assert_called_once()
+
+    def test_check_full_disk_access_rechecks_after_denial(self, chrome_home) -> None:
+        chrome_home.parent.mkdir(parents=True)
+        chrome_home.write_bytes(b"test")
+
+        with patch("builtins.open", side_effect=PermissionError("access denied")):
+            assert check_full_disk_access() is False
+
+        # Access granted after the prompt, without restarting the process
+        assert check_full_disk_access() is True
 
 
 class TestShowFullDiskAccessDialog:
@@ -12,12 +12,19 @@ Covers all acceptance criteria from plan lines 1235-1248:
 - Mode/model mapping
 """
 
+import functools
 import json
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from perplexity_deep_research.client import PerplexityClient
+from perplexity_deep_research.client import (
+    PerplexityClient,
+    _SESSION_HEADERS,
+    _encode_payload,
+    _iter_events,
+)
 from perplexity_deep_research.config import DEFAULT_HEADERS
 from perplexity_deep_research.exceptions import (
     AuthenticationError,
@@ -26,18 +33,119 @@ from perplexity_deep_research.exceptions import (
 )
 
 
-# Test fixtures
-@pytest.fixture
-def mock_cookies():
-    """Return test cookies with session_token_name."""
+def _capture_requests(session, response) -> list[dict]:
+    """Make ``session.request`` return ``response`` and record each call's kwargs."""
+    sent: list[dict] = []
+
+    def _capture(*args, **kwargs):
+        sent.append(kwargs)
+        return response
+
+    session.request.side_effect = _capture
+    return sent
+
+
+def _sent_payload(kwargs: dict) -> dict:
+    """Decode the JSON body from captured session.request kwargs."""
+    if "data" in kwargs:
+        return json.loads(kwargs["data"])
+    return kwargs["json"]
+
+
+@functools.cache
+def _sse_reads(events: tuple[bytes, ...], chunk_size: int) -> tuple[bytes, ...]:
+    """Frame SSE events and re-split them like arbitrary network reads."""
+    body = b"".join(event + b"\r\n\r\n" for event in events)
+    return tuple(body[i : i + chunk_size] for i in range(0, len(body), chunk_size))
+
+
+def _sse_body(events, chunk_size: int = 16):
+    """Return a fresh iterator over the (cached) reads for ``events``."""
+    return iter(_sse_reads(tuple(events), chunk_size))
+
+
+def _response(status_code: int = 200, events=()) -> SimpleNamespace:
+    """Build a bare response stub exposing only what the client reads."""
+
+    def iter_content(chunk_size=None, decode_unicode=False):
+        # Mirrors curl_cffi's Response.iter_content, which ignores chunk_size
+        assert chunk_size is None, "curl_cffi ignores chunk_size and warns"
+        return _sse_body(events)
+
+    return SimpleNamespace(status_code=status_code, iter_content=iter_content)
+
+
+def _search_results(*urls: str) -> dict:
+    """Build a parsed response whose SEARCH_RESULTS step lists ``urls``."""
+    web_results = [{"url": url} for url in urls]
     return {
-        "session_token": "test-session-token",
-        "session_token_name": "__Secure-next-auth.session-token",
-        "csrf_token": "test-csrf-token",
-        "csrf_token_name": "__Secure-next-auth.csrf-token",
+        "text": [
+            {"step_type": "SEARCH_RESULTS", "content": {"web_results": web_results}}
+        ]
     }
 
 
+# Static SSE payloads, serialized once at import
+# FINAL step answers are themselves JSON-encoded strings
+_INNER_ANSWER = '{"answer": "This is the test answer."}'
+
+_TEXT_CONTENT = json.dumps(
+    [
+        {
+            "step_type": "SEARCH_RESULTS",
+            "content": {
+                "web_results": [
+                    {"url": "https://example.com/1"},
+                    {"url": "https://example.com/2"},
+                    {"url": "https://example.com/3"},
+                ]
+            },
+        },
+        {"step_type": "FINAL", "content": {"answer": _INNER_ANSWER}},
+    ]
+)
+
+_SSE_RESPONSE = {"backend_uuid": "test-backend-uuid", "text": _TEXT_CONTENT}
+
+_SSE_SUCCESS_BYTES = (
+    b"event: message\r\ndata: " + json.dumps(_SSE_RESPONSE).encode(),
+    b"event: end_of_stream\r\n",
+)
+
+# Response without FINAL step
+_SSE_NO_ANSWER_BYTES = (
+    b"event: message\r\ndata: "
+    + json.dumps(
+        {
+            "backend_uuid": "test",
+            "text": json.dumps([{"step_type": "SEARCH_RESULTS", "content": {}}]),
+        }
+    ).encode(),
+)
+
+
+# Every test in this module runs under the shared client patch bag
+# (see conftest.client_patches); tests that inspect the mocks request it.
+pytestmark = pytest.mark.usefixtures("client_patches")
+
+
+# Test fixtures
+@pytest.fixture(scope="module")
+def pure_client():
+    """Build one client per module for tests of session-independent methods.
+
+    Only for pure methods like parse_sse_response/extract_citations; tests that
+    assert on Session or request calls use a fresh client under client_patches.
+    """
+    target = "perplexity_deep_research.client"
+    with (
+        patch(f"{target}.get_cookies", return_value={}),
+        patch(f"{target}.to_http_cookies", return_value={}),
+        patch(f"{target}.requests.Session", spec=True),
+    ):
+        return PerplexityClient()
+
+
 @pytest.fixture
 def mock_http_cookies():
     """Return HTTP format cookies."""
@@ -47,619 +155,404 @@ def mock_http_cookies():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_sse_response_success():
-    """Return mock SSE response with FINAL step containing answer."""
-    text_content = json.dumps(
-        [
-            {
-                "step_type": "SEARCH_RESULTS",
-                "content": {
-                    "web_results": [
-                        {"url": "https://example.com/1"},
-                        {"url": "https://example.com/2"},
-                        {"url": "https://example.com/3"},
-                    ]
-                },
-            },
-            {
-                "step_type": "FINAL",
-                "content": {
-                    "answer": json.dumps({"answer": "This is the test answer."})
-                },
-            },
-        ]
-    )
-    return {
-        "backend_uuid": "test-backend-uuid",
-        "text": text_content,
-    }
+    """Return mock SSE response with FINAL step containing answer.
 
+    Module-scoped and shared; tests must not mutate it.
+    """
+    return _SSE_RESPONSE
 
-@pytest.fixture
-def mock_sse_chunks(mock_sse_response_success):
-    """Return mock SSE chunks as bytes."""
-    data = json.dumps(mock_sse_response_success)
-    return [
-        f"event: message\r\ndata: {data}".encode("utf-8"),
-        b"event: end_of_stream\r\n",
-    ]
 
+@pytest.fixture(scope="module")
+def mock_sse_chunks():
+    """Return mock SSE chunks as bytes, built once at import."""
+    return _SSE_SUCCESS_BYTES
 
-class TestClientUsesChromImpersonation:
-    """Test that client uses Chrome impersonation."""
 
-    def test_client_uses_chrome_impersonation(self, mock_cookies):
-        """Mock Session constructor, assert impersonate='chrome'."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-        ):
-            mock_session.return_value.get = MagicMock()
+class TestSessionConstruction:
+    """Test the Chrome-impersonating session built with the default headers."""
 
-            PerplexityClient()
+    def test_client_session_constructor_args(self, client_patches):
+        """Assert impersonate='chrome' and the 20 default headers in one init."""
+        PerplexityClient()
 
-            mock_session.assert_called_once()
-            call_kwargs = mock_session.call_args[1]
-            assert call_kwargs["impersonate"] == "chrome"
-
-
-class TestClientUsesDefaultHeaders:
-    """Test that client uses 20 default headers."""
-
-    def test_client_uses_default_headers(self, mock_cookies):
-        """Assert headers contains 20 entries."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-        ):
-            mock_session.return_value.get = MagicMock()
+        client_patches.session_cls.assert_called_once()
+        call_kwargs = client_patches.session_cls.call_args[1]
+        assert call_kwargs["impersonate"] == "chrome"
+        # The import-time Headers singleton is passed as-is, never rebuilt
+        headers = call_kwargs["headers"]
+        assert headers is _SESSION_HEADERS
+        assert headers == DEFAULT_HEADERS
+        assert len(headers) == 20
 
-            PerplexityClient()
+    def test_session_mock_is_specced(self, client_patches):
+        """Assert the patched session instance only exposes Session attributes."""
+        assert not hasattr(client_patches.session, "not_a_session_method")
+        assert hasattr(client_patches.session, "request")
 
-            call_kwargs = mock_session.call_args[1]
-            assert len(call_kwargs["headers"]) == 20
-            assert call_kwargs["headers"] == DEFAULT_HEADERS
+    def test_default_headers_read_only(self):
+        """Assert the shared header template can't be mutated."""
+        with pytest.raises(TypeError):
+            DEFAULT_HEADERS["x-test"] = "1"
 
 
 class TestAutoRefreshOn401:
     """Test auto-refresh on 401/403 errors."""
 
-    def test_auto_refresh_on_401(self, mock_cookies):
+    def test_auto_refresh_on_401(self, client_patches):
         """Mock 401, verify _refresh_cookies called, verify retry."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-            patch(
-                "perplexity_deep_research.client.extract_cookies_with_relaunch",
-                return_value=mock_cookies,
-            ),
-            patch("perplexity_deep_research.client.save_cookies"),
-            patch("perplexity_deep_research.client.time.sleep"),
-        ):
-            # First call returns 401, second returns 200
-            mock_response_401 = MagicMock()
-            mock_response_401.status_code = 401
+        # First call returns 401, second returns 200
+        mock_response_401 = _response(401)
+
+        mock_response_200 = _response()
+
+        session = client_patches.session
+        session.request.side_effect = [
+            mock_response_401,
+            mock_response_200,
+        ]
+
+        client = PerplexityClient()
+        response = client._request_with_retry("GET", "https://test.com")
+
+        assert response.status_code == 200
+        # Session is reused; only its cookie jar is replaced
+        assert client_patches.session_cls.call_count == 1
+        session.cookies.clear.assert_called_once_with()
+        session.cookies.update.assert_called_once_with({"test": "cookie"})
+        # Refreshed cookies are retried directly, without re-bootstrapping
+        assert session.get.call_count == 1
 
-            mock_response_200 = MagicMock()
-            mock_response_200.status_code = 200
+    def test_bootstrap_only_when_refresh_retry_fails(self, client_patches):
+        """Mock 401 twice then 200, verify lazy bootstrap before final retry."""
+        mock_response_401 = _response(401)
 
-            session_instance = MagicMock()
-            session_instance.request.side_effect = [
-                mock_response_401,
-                mock_response_200,
-            ]
-            mock_session.return_value = session_instance
+        mock_response_200 = _response()
 
-            client = PerplexityClient()
-            response = client._request_with_retry("GET", "https://test.com")
+        session = client_patches.session
+        session.request.side_effect = [
+            mock_response_401,
+            mock_response_401,
+            mock_response_200,
+        ]
+
+        client = PerplexityClient()
+        response = client._request_with_retry("GET", "https://test.com")
 
-            assert response.status_code == 200
-            # Session should be recreated (called twice: init + refresh)
-            assert mock_session.call_count == 2
+        assert response.status_code == 200
+        # init bootstrap + lazy bootstrap after the failed retry
+        assert session.get.call_count == 2
+        assert session.request.call_count == 3
 
 
+@pytest.mark.integration
 class TestSearchReturnsAnswerDict:
     """Test search returns proper answer dict."""
 
-    def test_search_returns_answer_dict(self, mock_cookies, mock_sse_chunks):
+    def test_search_returns_answer_dict(self, client_patches, mock_sse_chunks):
         """Mock successful response, assert shape."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-            patch("perplexity_deep_research.client.time.sleep"),
-        ):
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.iter_lines.return_value = iter(mock_sse_chunks)
-
-            session_instance = MagicMock()
-            session_instance.request.return_value = mock_response
-            mock_session.return_value = session_instance
-
-            client = PerplexityClient()
-            result = client.search(
-                query="test query",
-                mode="auto",
-                sources=["web"],
-                language="en-US",
-            )
+        mock_response = _response(events=mock_sse_chunks)
+        client_patches.session.request.return_value = mock_response
 
-            assert "answer" in result
-            assert "citations" in result
-            assert "backend_uuid" in result
-            assert result["answer"] == "This is the test answer."
-            assert result["backend_uuid"] == "test-backend-uuid"
+        client = PerplexityClient()
+        result = client.search(
+            query="test query",
+            mode="auto",
+            sources=["web"],
+            language="en-US",
+        )
+
+        assert "answer" in result
+        assert "citations" in result
+        assert "backend_uuid" in result
+        assert result["answer"] == "This is the test answer."
+        assert result["backend_uuid"] == "test-backend-uuid"
 
 
 class TestParseSSEResponse:
     """Test SSE response parsing."""
 
-    def test_parse_sse_response_extracts_answer(self, mock_cookies, mock_sse_chunks):
+    def test_parse_sse_response_extracts_answer(self, pure_client, mock_sse_chunks):
         """Verify FINAL step parsing."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-        ):
-            mock_session.return_value.get = MagicMock()
+        mock_stream = _response(events=mock_sse_chunks)
 
-            client = PerplexityClient()
+        result = pure_client.parse_sse_response(mock_stream)
 
-            mock_stream = MagicMock()
-            mock_stream.iter_lines.return_value = iter(mock_sse_chunks)
+        assert result["answer"] == "This is the test answer."
+        assert result["backend_uuid"] == "test-backend-uuid"
 
-            result = client.parse_sse_response(mock_stream)
+    def test_parse_sse_response_stdlib_json_fallback(
+        self, pure_client, mock_sse_chunks, monkeypatch
+    ):
+        """Verify parsing without orjson installed."""
+        monkeypatch.setattr("perplexity_deep_research.client._json_loads", json.loads)
 
-            assert result["answer"] == "This is the test answer."
-            assert result["backend_uuid"] == "test-backend-uuid"
+        mock_stream = _response(events=mock_sse_chunks)
 
-    def test_parse_sse_response_raises_on_empty(self, mock_cookies):
-        """Verify PerplexityError on no answer."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-        ):
-            mock_session.return_value.get = MagicMock()
+        result = pure_client.parse_sse_response(mock_stream)
 
-            client = PerplexityClient()
+        assert result["answer"] == "This is the test answer."
 
-            mock_stream = MagicMock()
-            mock_stream.iter_lines.return_value = iter([])
+    def test_parse_sse_response_uses_last_event(self, pure_client, mock_sse_chunks):
+        """Verify only the final message's text is parsed."""
+        # Intermediate event with a partial (unparseable) step list
+        partial = json.dumps({"backend_uuid": "partial", "text": "[{"})
+        chunks = [f"event: message\r\ndata: {partial}".encode("utf-8")]
+        chunks += mock_sse_chunks
 
-            with pytest.raises(PerplexityError, match="No response received"):
-                client.parse_sse_response(mock_stream)
+        mock_stream = _response(events=chunks)
 
-    def test_parse_sse_response_raises_on_no_answer(self, mock_cookies):
-        """Verify PerplexityError when no answer in response."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-        ):
-            mock_session.return_value.get = MagicMock()
+        result = pure_client.parse_sse_response(mock_stream)
 
-            client = PerplexityClient()
+        assert result["answer"] == "This is the test answer."
+        assert result["backend_uuid"] == "test-backend-uuid"
+        assert isinstance(result["text"], list)
 
-            # Response without FINAL step
-            text_content = json.dumps([{"step_type": "SEARCH_RESULTS", "content": {}}])
-            data = json.dumps({"backend_uuid": "test", "text": text_content})
-            chunks = [f"event: message\r\ndata: {data}".encode("utf-8")]
-
-            mock_stream = MagicMock()
-            mock_stream.iter_lines.return_value = iter(chunks)
-
-            with pytest.raises(PerplexityError, match="No answer found"):
-                client.parse_sse_response(mock_stream)
+    @pytest.mark.parametrize(
+        "events,msg",
+        [
+            pytest.param((), "No response received", id="empty"),
+            pytest.param(_SSE_NO_ANSWER_BYTES, "No answer found", id="no-final-step"),
+        ],
+    )
+    def test_parse_sse_response_raises(self, pure_client, events, msg):
+        """Verify PerplexityError on an empty stream or a response without answer."""
+        with pytest.raises(PerplexityError, match=msg):
+            pure_client.parse_sse_response(_response(events=events))
 
 
-class TestExtractCitations:
-    """Test citations extraction."""
+class TestIterEvents:
+    """Test splitting a chunked SSE body into events."""
 
-    def test_extract_citations_parsing(self, mock_cookies):
-        """Verify web_results extraction and 10-item cap."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-        ):
-            mock_session.return_value.get = MagicMock()
-
-            client = PerplexityClient()
-
-            # Create response with 15 URLs (should cap at 10)
-            web_results = [{"url": f"https://example.com/{i}"} for i in range(15)]
-            response = {
-                "text": [
-                    {
-                        "step_type": "SEARCH_RESULTS",
-                        "content": {"web_results": web_results},
-                    }
-                ]
-            }
+    def test_separator_split_across_chunks(self):
+        """Assert events are rejoined when a separator straddles two reads."""
+        chunks = [b"event: a\r\n", b"\r\nevent: b\r", b"\n\r\n"]
 
-            citations = client.extract_citations(response)
+        assert list(_iter_events(chunks)) == [b"event: a", b"event: b"]
 
-            assert len(citations) == 10
-            assert citations[0] == "https://example.com/0"
-            assert citations[9] == "https://example.com/9"
+    def test_multiple_events_in_one_chunk(self):
+        """Assert every event in a single read is yielded in order."""
+        chunks = [b"one\r\n\r\ntwo\r\n\r\nthree"]
 
-    def test_extract_citations_deduplicates(self, mock_cookies):
-        """Verify duplicate URLs are removed."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-        ):
-            mock_session.return_value.get = MagicMock()
-
-            client = PerplexityClient()
-
-            response = {
-                "text": [
-                    {
-                        "step_type": "SEARCH_RESULTS",
-                        "content": {
-                            "web_results": [
-                                {"url": "https://example.com/1"},
-                                {"url": "https://example.com/1"},  # Duplicate
-                                {"url": "https://example.com/2"},
-                            ]
-                        },
-                    }
-                ]
-            }
+        assert list(_iter_events(chunks)) == [b"one", b"two", b"three"]
 
-            citations = client.extract_citations(response)
 
-            assert len(citations) == 2
-            assert "https://example.com/1" in citations
-            assert "https://example.com/2" in citations
+class TestExtractCitations:
+    """Test citations extraction."""
 
-    def test_extract_citations_from_widget_data(self, mock_cookies):
-        """Verify widget_data fallback extraction."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
+    @pytest.mark.parametrize(
+        "response,expected",
+        [
+            pytest.param(
+                _search_results(*(f"https://example.com/{i}" for i in range(15))),
+                [f"https://example.com/{i}" for i in range(10)],
+                id="web_results-capped-at-10",
+            ),
+            pytest.param(
+                _search_results(
+                    "https://example.com/1",
+                    "https://example.com/1",
+                    "https://example.com/2",
+                ),
+                ["https://example.com/1", "https://example.com/2"],
+                id="deduplicates",
+            ),
+            pytest.param(
+                {
+                    "text": [],
+                    "widget_data": [
+                        {"url": "https://widget.com/1"},
+                        {"url": "https://widget.com/2"},
+                    ],
+                },
+                ["https://widget.com/1", "https://widget.com/2"],
+                id="widget_data-fallback",
             ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
+            pytest.param(
+                {
+                    **_search_results("https://example.com/1"),
+                    "widget_data": [
+                        {"url": "https://example.com/1"},
+                        {"url": "https://widget.com/1"},
+                    ],
+                },
+                ["https://example.com/1", "https://widget.com/1"],
+                id="dedupes-across-sources",
             ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-        ):
-            mock_session.return_value.get = MagicMock()
+            pytest.param({}, [], id="empty"),
+        ],
+    )
+    def test_extract_citations(self, pure_client, response, expected):
+        """Verify web_results/widget_data extraction, dedup and the 10-item cap."""
+        assert pure_client.extract_citations(response) == expected
 
-            client = PerplexityClient()
 
-            response = {
-                "text": [],
-                "widget_data": [
-                    {"url": "https://widget.com/1"},
-                    {"url": "https://widget.com/2"},
-                ],
-            }
+class TestRandomDelay:
+    """Test random delay before requests."""
 
-            citations = client.extract_citations(response)
+    def test_random_delay_called(self, client_patches, monkeypatch):
+        """Mock time.sleep, assert jitter between rapid requests is <= 1s."""
+        mock_uniform = MagicMock(return_value=0.5)
+        mock_sleep = MagicMock()
+        monkeypatch.setattr(
+            "perplexity_deep_research.client.time.monotonic",
+            MagicMock(side_effect=[100.0, 100.0, 100.25, 100.25]),
+        )
+        monkeypatch.setattr(
+            "perplexity_deep_research.client.random.uniform", mock_uniform
+        )
+        monkeypatch.setattr("perplexity_deep_research.client.time.sleep", mock_sleep)
+        client_patches.session.request.return_value = _response()
 
-            assert len(citations) == 2
-            assert "https://widget.com/1" in citations
-            assert "https://widget.com/2" in citations
+        client = PerplexityClient()
+        client._request_with_retry("GET", "https://test.com")
+        client._request_with_retry("GET", "https://test.com")
 
+        mock_uniform.assert_called_once_with(0.1, 0.75)
+        mock_sleep.assert_called_once_with(0.5)
 
-class TestRandomDelay:
-    """Test random delay before requests."""
+    def test_random_delay_skipped_on_first_request(self, client_patches, monkeypatch):
+        """Assert the first request goes out without sleeping."""
+        mock_sleep = MagicMock()
+        client_patches.session.request.return_value = _response()
 
-    def test_random_delay_called(self, mock_cookies):
-        """Mock time.sleep, assert called with value in [1.0, 3.0]."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-            patch("perplexity_deep_research.client.time.sleep") as mock_sleep,
-            patch(
-                "perplexity_deep_research.client.random.uniform", return_value=2.0
-            ) as mock_uniform,
-        ):
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-
-            session_instance = MagicMock()
-            session_instance.request.return_value = mock_response
-            mock_session.return_value = session_instance
-
-            client = PerplexityClient()
-            client._request_with_retry("GET", "https://test.com")
+        client = PerplexityClient()
+        monkeypatch.setattr("perplexity_deep_research.client.time.sleep", mock_sleep)
+        client._request_with_retry("GET", "https://test.com")
 
-            mock_uniform.assert_called_with(1.0, 3.0)
-            mock_sleep.assert_called_with(2.0)
+        mock_sleep.assert_not_called()
 
 
 class TestErrorHandling:
     """Test error handling for various HTTP status codes."""
 
-    def test_rate_limit_429_raises(self, mock_cookies):
-        """Mock 429, assert RateLimitError."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-            patch("perplexity_deep_research.client.time.sleep"),
-        ):
-            mock_response = MagicMock()
-            mock_response.status_code = 429
-
-            session_instance = MagicMock()
-            session_instance.request.return_value = mock_response
-            mock_session.return_value = session_instance
-
-            client = PerplexityClient()
-
-            with pytest.raises(RateLimitError, match="Rate limit exceeded"):
-                client._request_with_retry("GET", "https://test.com")
-
-    def test_server_error_500_raises(self, mock_cookies):
-        """Mock 500, assert PerplexityError."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-            patch("perplexity_deep_research.client.time.sleep"),
-        ):
-            mock_response = MagicMock()
-            mock_response.status_code = 500
-
-            session_instance = MagicMock()
-            session_instance.request.return_value = mock_response
-            mock_session.return_value = session_instance
-
-            client = PerplexityClient()
-
-            with pytest.raises(PerplexityError, match="API error: HTTP 500"):
-                client._request_with_retry("GET", "https://test.com")
-
-    def test_auth_error_after_retry_raises(self, mock_cookies):
-        """Mock 401 twice, assert AuthenticationError."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-            patch(
-                "perplexity_deep_research.client.extract_cookies_with_relaunch",
-                return_value=mock_cookies,
-            ),
-            patch("perplexity_deep_research.client.save_cookies"),
-            patch("perplexity_deep_research.client.time.sleep"),
-        ):
-            mock_response = MagicMock()
-            mock_response.status_code = 401
-
-            session_instance = MagicMock()
-            session_instance.request.return_value = mock_response
-            mock_session.return_value = session_instance
+    @pytest.mark.parametrize(
+        "status,exc,msg",
+        [
+            (429, RateLimitError, "Rate limit exceeded"),
+            (500, PerplexityError, "API error: HTTP 500"),
+            (401, AuthenticationError, "Authentication failed after retry"),
+        ],
+    )
+    def test_error_status_raises(self, client_patches, status, exc, msg):
+        """Mock an error status on every attempt, assert the mapped exception."""
+        mock_response = _response(status)
+        client_patches.session.request.return_value = mock_response
 
-            client = PerplexityClient()
+        client = PerplexityClient()
 
-            with pytest.raises(
-                AuthenticationError, match="Authentication failed after retry"
-            ):
-                client._request_with_retry("GET", "https://test.com")
+        with pytest.raises(exc, match=msg):
+            client._request_with_retry("GET", "https://test.com")
 
 
+@pytest.mark.integration
 class TestFollowUpPayload:
     """Test follow-up query payload."""
 
-    def test_follow_up_payload_includes_uuid(self, mock_cookies, mock_sse_chunks):
+    def test_follow_up_payload_includes_uuid(self, client_patches, mock_sse_chunks):
         """Assert params.last_backend_uuid equals UUID."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-            patch("perplexity_deep_research.client.time.sleep"),
-        ):
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.iter_lines.return_value = iter(mock_sse_chunks)
-
-            session_instance = MagicMock()
-            session_instance.request.return_value = mock_response
-            mock_session.return_value = session_instance
-
-            client = PerplexityClient()
-            client.search(
-                query="follow up query",
-                mode="auto",
-                sources=["web"],
-                language="en-US",
-                follow_up="previous-backend-uuid",
-            )
+        sent = _capture_requests(
+            client_patches.session, _response(events=mock_sse_chunks)
+        )
 
-            # Get the payload from the request call
-            call_args = session_instance.request.call_args
-            payload = call_args[1]["json"]
+        client = PerplexityClient()
+        client.search(
+            query="follow up query",
+            mode="auto",
+            sources=["web"],
+            language="en-US",
+            follow_up="previous-backend-uuid",
+        )
 
-            assert payload["params"]["last_backend_uuid"] == "previous-backend-uuid"
+        payload = _sent_payload(sent[-1])
 
+        assert payload["params"]["last_backend_uuid"] == "previous-backend-uuid"
 
+
+@pytest.mark.integration
 class TestModeMapping:
     """Test mode/model mapping for different modes."""
 
-    def test_payload_deep_research(self, mock_cookies, mock_sse_chunks):
-        """Assert mode='copilot', model_preference='pplx_alpha'."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-            patch("perplexity_deep_research.client.time.sleep"),
-        ):
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.iter_lines.return_value = iter(mock_sse_chunks)
-
-            session_instance = MagicMock()
-            session_instance.request.return_value = mock_response
-            mock_session.return_value = session_instance
-
-            client = PerplexityClient()
+    @pytest.mark.parametrize(
+        "mode,exp_mode,exp_model",
+        [
+            ("deep research", "copilot", "pplx_alpha"),
+            ("pro", "copilot", "pplx_pro"),
+            ("reasoning", "copilot", "r1"),
+            ("auto", "concise", "turbo"),
+        ],
+    )
+    def test_payload_mode_mapping(
+        self, client_patches, mock_sse_chunks, mode, exp_mode, exp_model
+    ):
+        """Assert each logical mode sends its payload mode and model_preference."""
+        sent = _capture_requests(
+            client_patches.session, _response(events=mock_sse_chunks)
+        )
+
+        client = PerplexityClient()
+        client.search(
+            query="test",
+            mode=mode,
+            sources=["web"],
+            language="en-US",
+        )
+
+        payload = _sent_payload(sent[-1])
+
+        assert payload["params"]["mode"] == exp_mode
+        assert payload["params"]["model_preference"] == exp_model
+
+    def test_unknown_mode_raises(self, client_patches):
+        """Assert an unknown mode raises PerplexityError before any request."""
+        client = PerplexityClient()
+        with pytest.raises(PerplexityError, match="Unknown mode: turbo"):
             client.search(
                 query="test",
-                mode="deep research",
+                mode="turbo",
                 sources=["web"],
                 language="en-US",
             )
 
-            call_args = session_instance.request.call_args
-            payload = call_args[1]["json"]
+        client_patches.session.request.assert_not_called()
 
-            assert payload["params"]["mode"] == "copilot"
-            assert payload["params"]["model_preference"] == "pplx_alpha"
 
-    def test_payload_pro(self, mock_cookies, mock_sse_chunks):
-        """Assert mode='copilot', model_preference='pplx_pro'."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-            patch("perplexity_deep_research.client.time.sleep"),
-        ):
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.iter_lines.return_value = iter(mock_sse_chunks)
-
-            session_instance = MagicMock()
-            session_instance.request.return_value = mock_response
-            mock_session.return_value = session_instance
-
-            client = PerplexityClient()
-            client.search(
-                query="test",
-                mode="pro",
-                sources=["web"],
-                language="en-US",
-            )
+@pytest.mark.integration
+class TestFrontendUUID:
+    """Test client identifiers sent with each search payload."""
 
-            call_args = session_instance.request.call_args
-            payload = call_args[1]["json"]
+    def test_frontend_uuid_stable_across_searches(
+        self, client_patches, mock_sse_chunks
+    ):
+        """Assert frontend_uuid is reused while frontend_context_uuid is fresh."""
+        sent = _capture_requests(
+            client_patches.session, _response(events=mock_sse_chunks)
+        )
 
-            assert payload["params"]["mode"] == "copilot"
-            assert payload["params"]["model_preference"] == "pplx_pro"
+        client = PerplexityClient()
+        for _ in range(2):
+            client.search(query="test", mode="auto", sources=["web"], language="en-US")
 
-    def test_payload_auto(self, mock_cookies, mock_sse_chunks):
-        """Assert mode='concise', model_preference='turbo'."""
-        with (
-            patch(
-                "perplexity_deep_research.client.get_cookies", return_value=mock_cookies
-            ),
-            patch(
-                "perplexity_deep_research.client.to_http_cookies",
-                return_value={"test": "cookie"},
-            ),
-            patch("perplexity_deep_research.client.requests.Session") as mock_session,
-            patch("perplexity_deep_research.client.time.sleep"),
-        ):
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.iter_lines.return_value = iter(mock_sse_chunks)
-
-            session_instance = MagicMock()
-            session_instance.request.return_value = mock_response
-            mock_session.return_value = session_instance
-
-            client = PerplexityClient()
-            client.search(
-                query="test",
-                mode="auto",
-                sources=["web"],
-                language="en-US",
-            )
+        first, second = (_sent_payload(kwargs)["params"] for kwargs in sent)
+        assert first["frontend_uuid"] == second["frontend_uuid"]
+        assert first["frontend_context_uuid"] != second["frontend_context_uuid"]
+
+
+class TestPayloadEncoding:
+    """Test request body serialization for search payloads."""
+
+    def test_payload_preserialized_with_orjson(self):
+        """Assert orjson encodes the payload once to bytes with a JSON header."""
+        pytest.importorskip("orjson")
+
+        body = _encode_payload({"query_str": "test"})
+
+        assert body["data"] == b'{"query_str":"test"}'
+        assert body["headers"] == {"content-type": "application/json"}
 
-            call_args = session_instance.request.call_args
-            payload = call_args[1]["json"]
+    def test_payload_json_fallback_without_orjson(self, monkeypatch):
+        """Assert the stdlib path hands the dict to curl_cffi via json=."""
+        monkeypatch.setattr("perplexity_deep_research.client.orjson", None)
 
-            assert payload["params"]["mode"] == "concise"
-            assert payload["params"]["model_preference"] == "turbo"
+        assert _encode_payload({"query_str": "test"}) == {"json": {"query_str": "test"}}
@@ -11,13 +11,17 @@ Tests cover:
 """
 
 import json
+import re
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import SimpleNamespace
 from sqlite3 import OperationalError
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock, patch
 
 import pytest
 
+from perplexity_deep_research import cookies as cookies_module
+from perplexity_deep_research.browser_control import ChromeAccessResult
 from perplexity_deep_research.cookies import (
     extract_cookies_raw,
     extract_cookies_with_relaunch,
@@ -31,45 +35,101 @@ from perplexity_deep_research.cookies import (
 from perplexity_deep_research.exceptions import CookieExtractionError
 
 
-@pytest.fixture(autouse=True)
+# Sample cookies shared across tests; never mutated
+_SECURE_SESSION = "eyJ0eXAiOiJKV1QiLCJhbGc..."
+_RAW_COOKIES = {"__Secure-next-auth.session-token": _SECURE_SESSION}
+_RAW_SECURE = {**_RAW_COOKIES, "__Secure-next-auth.csrf-token": "abc123def456"}
+_NORMALIZED_SESSION_ONLY = {
+    "session_token": _SECURE_SESSION,
+    "session_token_name": "__Secure-next-auth.session-token",
+}
+_NORMALIZED_WITH_CSRF = {
+    **_NORMALIZED_SESSION_ONLY,
+    "csrf_token": "abc123def456",
+    "csrf_token_name": "__Secure-next-auth.csrf-token",
+}
+
+# CookieExtractionError messages, compiled once for pytest.raises(match=...)
+_ERR_NO_SESSION = re.compile("No session token found")
+_ERR_CHROME_NOT_CLOSED = re.compile("could not be closed")
+_ERR_FDA = re.compile("Full Disk Access required")
+_ERR_KEYCHAIN_CANCELLED = re.compile("Keychain access cancelled")
+_ERR_NOT_FOUND = re.compile("Chrome cookie file not found")
+
+
+@pytest.fixture
 def isolate_cookies_file(tmp_path, monkeypatch):
-    """Redirect PERPLEXITY_COOKIES_FILE to tmp_path for all tests."""
+    """Redirect PERPLEXITY_COOKIES_FILE to tmp_path for persistence tests."""
     test_cookies_file = tmp_path / "cookies.json"
     monkeypatch.setenv("PERPLEXITY_COOKIES_FILE", str(test_cookies_file))
     return test_cookies_file
 
 
+@pytest.fixture(autouse=True)
+def reset_cookie_cache(monkeypatch):
+    """Start every test without cached cookie files or Chrome paths."""
+    monkeypatch.setattr(cookies_module, "_cookie_cache", None)
+    cookies_module._resolve_chrome_cookie_path.cache_clear()
+
+
 class TestExtractCookiesRaw:
     """Tests for extract_cookies_raw() function."""
 
-    def test_extract_cookies_success(self):
+    def test_extract_cookies_success(self, chrome_dir):
         """Test successful cookie extraction from Chrome."""
-        raw_cookies = {
-            "__Secure-next-auth.session-token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
-            "__Secure-next-auth.csrf-token": "abc123def456",
-        }
+        _touch_cookie_db(chrome_dir, "Default")  # Never the real profile
 
-        with patch("perplexity_deep_research.cookies.chrome_cookies") as mock_chrome:
-            mock_chrome.return_value = raw_cookies
+        with patch.object(cookies_module, "chrome_cookies") as mock_chrome:
+            mock_chrome.return_value = _RAW_SECURE
             result = extract_cookies_raw()
 
-        assert result == raw_cookies
+        assert result == _RAW_SECURE
         assert "session_token" not in result  # Raw, not normalized
 
+    def test_extract_cookies_reads_snapshot(self, tmp_path):
+        """Test pycookiecheat reads a temp copy of the DB and its WAL."""
+        live_db = tmp_path / "Cookies"
+        live_db.write_bytes(b"db")
+        (tmp_path / "Cookies-wal").write_bytes(b"wal")
+        seen = {}
+
+        def fake_chrome_cookies(**kwargs):
+            snapshot = Path(kwargs["cookie_file"])
+            seen["path"] = snapshot
+            seen["db"] = snapshot.read_bytes()
+            seen["wal"] = Path(f"{snapshot}-wal").read_bytes()
+            seen["shm"] = Path(f"{snapshot}-shm").exists()
+            return {}
+
+        with (
+            patch.object(
+                cookies_module,
+                "get_chrome_cookie_path",
+                return_value=str(live_db),
+            ),
+            patch.object(
+                cookies_module,
+                "chrome_cookies",
+                side_effect=fake_chrome_cookies,
+            ),
+        ):
+            extract_cookies_raw()
+
+        assert seen["path"] != live_db
+        assert seen["db"] == b"db"
+        assert seen["wal"] == b"wal"
+        assert seen["shm"] is False
+        assert not seen["path"].exists()  # Snapshot removed afterwards
+
 
 class TestNormalizeCookies:
     """Tests for normalize_cookies() function."""
 
     def test_normalize_cookies_secure_prefix(self):
         """Test normalization with __Secure- variant."""
-        raw_cookies = {
-            "__Secure-next-auth.session-token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
-            "__Secure-next-auth.csrf-token": "abc123def456",
-        }
-
-        result = normalize_cookies(raw_cookies)
+        result = normalize_cookies(_RAW_SECURE)
 
-        assert result["session_token"] == "eyJ0eXAiOiJKV1QiLCJhbGc..."
+        assert result["session_token"] == _SECURE_SESSION
         assert result["session_token_name"] == "__Secure-next-auth.session-token"
         assert result["csrf_token"] == "abc123def456"
         assert result["csrf_token_name"] == "__Secure-next-auth.csrf-token"
@@ -77,13 +137,13 @@ class TestNormalizeCookies:
     def test_normalize_cookies_plain(self):
         """Test normalization with plain next-auth. variant."""
         raw_cookies = {
-            "next-auth.session-token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
+            "next-auth.session-token": _SECURE_SESSION,
             "next-auth.csrf-token": "xyz789",
         }
 
         result = normalize_cookies(raw_cookies)
 
-        assert result["session_token"] == "eyJ0eXAiOiJKV1QiLCJhbGc..."
+        assert result["session_token"] == _SECURE_SESSION
         assert result["session_token_name"] == "next-auth.session-token"
         assert result["csrf_token"] == "xyz789"
         assert result["csrf_token_name"] == "next-auth.csrf-token"
@@ -109,7 +169,7 @@ class TestNormalizeCookies:
             "__Secure-next-auth.csrf-token": "abc123",
         }
 
-        with pytest.raises(CookieExtractionError, match="No session token found"):
+        with pytest.raises(CookieExtractionError, match=_ERR_NO_SESSION):
             normalize_cookies(raw_cookies)
 
     def test_normalize_cookies_optional_csrf(self):
@@ -124,38 +184,36 @@ class TestNormalizeCookies:
         assert "csrf_token" not in result
         assert "csrf_token_name" not in result
 
+    def test_normalize_cookies_prebuilds_http(self):
+        """Test the HTTP form is built once and reused by to_http_cookies()."""
+        raw_cookies = {
+            "__Secure-next-auth.session-token": "session_value",
+            "next-auth.csrf-token": "csrf_value",
+        }
+
+        result = normalize_cookies(raw_cookies)
+
+        assert result["_http"] == {
+            "__Secure-next-auth.session-token": "session_value",
+            "next-auth.csrf-token": "csrf_value",
+        }
+        assert to_http_cookies(result) is result["_http"]
+
 
 class TestToHttpCookies:
     """Tests for to_http_cookies() function."""
 
     def test_to_http_cookies_with_csrf(self):
         """Test HTTP reconstruction with both session and CSRF tokens."""
-        normalized = {
-            "session_token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
-            "session_token_name": "__Secure-next-auth.session-token",
-            "csrf_token": "abc123def456",
-            "csrf_token_name": "__Secure-next-auth.csrf-token",
-        }
-
-        result = to_http_cookies(normalized)
+        result = to_http_cookies(_NORMALIZED_WITH_CSRF)
 
-        assert result == {
-            "__Secure-next-auth.session-token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
-            "__Secure-next-auth.csrf-token": "abc123def456",
-        }
+        assert result == _RAW_SECURE
 
     def test_to_http_cookies_without_csrf(self):
         """Test HTTP reconstruction with only session token."""
-        normalized = {
-            "session_token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
-            "session_token_name": "__Secure-next-auth.session-token",
-        }
-
-        result = to_http_cookies(normalized)
+        result = to_http_cookies(_NORMALIZED_SESSION_ONLY)
 
-        assert result == {
-            "__Secure-next-auth.session-token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
-        }
+        assert result == _RAW_COOKIES
 
     def test_to_http_cookies_preserves_original_names(self):
         """Test that original cookie names are preserved in HTTP format."""
@@ -181,16 +239,29 @@ class TestSaveCookies:
     def test_save_cookies(self, isolate_cookies_file):
         """Test saving cookies to JSON file."""
         cookies = {
-            "session_token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
+            "session_token": _SECURE_SESSION,
             "session_token_name": "__Secure-next-auth.session-token",
         }
 
         save_cookies(cookies, isolate_cookies_file)
 
         assert isolate_cookies_file.exists()
-        data = json.loads(isolate_cookies_file.read_text())
+        data = json.loads(isolate_cookies_file.read_bytes())
         assert data["cookies"] == cookies
-        assert "extracted_at" in data
+        assert isinstance(data["extracted_at"], float)
+
+    def test_save_cookies_stdlib_json_fallback(self, isolate_cookies_file, monkeypatch):
+        """Test cookies round-trip when orjson is not installed."""
+        monkeypatch.setattr(cookies_module, "orjson", None)
+        monkeypatch.setattr(cookies_module, "_json_loads", json.loads)
+        cookies = {
+            "session_token": "token_value",
+            "session_token_name": "__Secure-next-auth.session-token",
+        }
+
+        save_cookies(cookies, isolate_cookies_file)
+
+        assert load_cookies(isolate_cookies_file) == cookies
 
     def test_save_cookies_creates_parent_dir(self, tmp_path, monkeypatch):
         """Test that save_cookies creates parent directory if missing."""
@@ -207,6 +278,20 @@ class TestSaveCookies:
         assert cookies_file.exists()
         assert cookies_file.parent.exists()
 
+    def test_save_cookies_atomic_replace(self, isolate_cookies_file):
+        """Test a failed write leaves the previous file and no temp files."""
+        old = {"session_token": "old_token"}
+        save_cookies(old, isolate_cookies_file)
+
+        with (
+            patch.object(cookies_module.os, "replace", side_effect=OSError("full")),
+            pytest.raises(OSError),
+        ):
+            save_cookies({"session_token": "new_token"}, isolate_cookies_file)
+
+        assert json.loads(isolate_cookies_file.read_bytes())["cookies"] == old
+        assert list(isolate_cookies_file.parent.iterdir()) == [isolate_cookies_file]
+
     def test_save_cookies_with_default_path(self, isolate_cookies_file):
         """Test save_cookies uses get_cookies_file_path() by default."""
         cookies = {
@@ -225,7 +310,7 @@ class TestLoadCookies:
     def test_load_cookies_valid(self, isolate_cookies_file):
         """Test loading valid cookies (age < 24h)."""
         cookies = {
-            "session_token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
+            "session_token": _SECURE_SESSION,
             "session_token_name": "__Secure-next-auth.session-token",
         }
         save_cookies(cookies, isolate_cookies_file)
@@ -237,25 +322,46 @@ class TestLoadCookies:
     def test_load_cookies_expired(self, isolate_cookies_file):
         """Test that expired cookies return None."""
         cookies = {
-            "session_token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
+            "session_token": _SECURE_SESSION,
             "session_token_name": "__Secure-next-auth.session-token",
         }
 
         # Save with old timestamp
         old_time = (datetime.now() - timedelta(hours=25)).isoformat()
         data = {"cookies": cookies, "extracted_at": old_time}
-        isolate_cookies_file.write_text(json.dumps(data))
+        isolate_cookies_file.write_bytes(cookies_module._json_dumps(data))
 
         result = load_cookies(isolate_cookies_file)
 
         assert result is None
 
+    def test_load_cookies_legacy_iso_timestamp(self, isolate_cookies_file):
+        """Test files written with an ISO extracted_at still load."""
+        cookies = {
+            "session_token": _SECURE_SESSION,
+            "session_token_name": "__Secure-next-auth.session-token",
+        }
+        recent = (datetime.now() - timedelta(hours=1)).isoformat()
+        data = {"cookies": cookies, "extracted_at": recent}
+        isolate_cookies_file.write_bytes(cookies_module._json_dumps(data))
+
+        assert load_cookies(isolate_cookies_file) == cookies
+
     def test_load_cookies_missing_file(self, isolate_cookies_file):
         """Test that missing file returns None."""
         result = load_cookies(isolate_cookies_file)
 
         assert result is None
 
+    def test_load_cookies_removed_before_open(self, isolate_cookies_file):
+        """Test a file deleted between stat and open is treated as missing."""
+        save_cookies({"session_token": "t"}, isolate_cookies_file)
+
+        with patch("builtins.open", side_effect=FileNotFoundError):
+            result = load_cookies(isolate_cookies_file)
+
+        assert result is None
+
     def test_load_cookies_with_default_path(self, isolate_cookies_file):
         """Test load_cookies uses get_cookies_file_path() by default."""
         cookies = {
@@ -268,181 +374,145 @@ class TestLoadCookies:
 
         assert result == cookies
 
+    def test_load_cookies_cached_until_file_changes(self, isolate_cookies_file):
+        """Test repeated loads skip re-reading until the file is rewritten."""
+        cookies = {
+            "session_token": "token_value",
+            "session_token_name": "__Secure-next-auth.session-token",
+        }
+        save_cookies(cookies, isolate_cookies_file)
+        load_cookies(isolate_cookies_file)
+
+        with patch("builtins.open") as mock_read:
+            assert load_cookies(isolate_cookies_file) == cookies
+            mock_read.assert_not_called()
+
+        newer = {**cookies, "session_token": "newer_token"}
+        save_cookies(newer, isolate_cookies_file)
+
+        assert load_cookies(isolate_cookies_file) == newer
+
+
+@pytest.fixture
+def relaunch_mocks(monkeypatch):
+    """Stub every collaborator of extract_cookies_with_relaunch().
+
+    Full Disk Access is granted by default; tests set ``return_value`` or
+    ``side_effect`` on the namespace attributes they care about.
+    """
+    targets = {
+        "fda": "check_full_disk_access",
+        "dialog": "show_full_disk_access_dialog",
+        "extract": "extract_cookies_raw",
+        "ensure": "ensure_chrome_accessible",
+        "relaunch": "relaunch_chrome",
+        "prompt": "prompt_keychain_password",
+    }
+    # spec= on the real function keeps each stub a plain callable Mock
+    mocks = SimpleNamespace(
+        **{
+            key: Mock(spec=getattr(cookies_module, name))
+            for key, name in targets.items()
+        },
+        sleep=Mock(spec=cookies_module.time.sleep),
+    )
+    mocks.fda.return_value = True
+    for key, name in targets.items():
+        monkeypatch.setattr(cookies_module, name, getattr(mocks, key))
+    monkeypatch.setattr(cookies_module.time, "sleep", mocks.sleep)
+    return mocks
+
 
 class TestExtractCookiesWithRelaunch:
     """Tests for extract_cookies_with_relaunch() function."""
 
-    def test_extract_succeeds_without_prompt_if_not_locked(self):
+    def test_extract_succeeds_without_prompt_if_not_locked(self, relaunch_mocks):
         """Test TRY-FIRST: extraction succeeds → no Chrome prompt called."""
-        raw_cookies = {
-            "__Secure-next-auth.session-token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
-        }
+        relaunch_mocks.extract.return_value = _RAW_COOKIES
 
-        with (
-            patch(
-                "perplexity_deep_research.cookies.check_full_disk_access"
-            ) as mock_fda,
-            patch(
-                "perplexity_deep_research.cookies.extract_cookies_raw"
-            ) as mock_extract,
-            patch(
-                "perplexity_deep_research.cookies.ensure_chrome_accessible"
-            ) as mock_ensure,
-        ):
-            mock_fda.return_value = True
-            mock_extract.return_value = raw_cookies
+        result = extract_cookies_with_relaunch()
 
-            result = extract_cookies_with_relaunch()
+        assert result["session_token"] == _SECURE_SESSION
+        relaunch_mocks.ensure.assert_not_called()
 
-            assert result["session_token"] == "eyJ0eXAiOiJKV1QiLCJhbGc..."
-            mock_ensure.assert_not_called()
-
-    def test_extract_prompts_only_when_locked(self):
+    def test_extract_prompts_only_when_locked(self, relaunch_mocks):
         """Test that Chrome prompt is only called when DB is locked."""
-        raw_cookies = {
-            "__Secure-next-auth.session-token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
-        }
-
         lock_error = OperationalError("database is locked")
+        # Initial read plus every backoff retry stays locked
+        relaunch_mocks.extract.side_effect = [lock_error] * 4 + [_RAW_COOKIES]
+        relaunch_mocks.ensure.return_value = ChromeAccessResult(
+            was_running=True, was_quit=True, accessible=True
+        )
+
+        result = extract_cookies_with_relaunch()
+
+        relaunch_mocks.ensure.assert_called_once()
+        relaunch_mocks.relaunch.assert_called_once()
+        sleeps = [c.args[0] for c in relaunch_mocks.sleep.call_args_list]
+        assert sleeps == [0.05, 0.15, 0.3]
+        assert result["session_token"] == _SECURE_SESSION
+
+    def test_extract_retries_transient_lock_without_prompt(self, relaunch_mocks):
+        """Test a lock released during backoff never reaches the Chrome prompt."""
+        relaunch_mocks.extract.side_effect = [
+            OperationalError("database is locked"),
+            _RAW_COOKIES,
+        ]
 
-        with (
-            patch(
-                "perplexity_deep_research.cookies.check_full_disk_access"
-            ) as mock_fda,
-            patch(
-                "perplexity_deep_research.cookies.extract_cookies_raw"
-            ) as mock_extract,
-            patch(
-                "perplexity_deep_research.cookies.ensure_chrome_accessible"
-            ) as mock_ensure,
-            patch("perplexity_deep_research.cookies.relaunch_chrome") as mock_relaunch,
-        ):
-            mock_fda.return_value = True
-            mock_extract.side_effect = [lock_error, raw_cookies]
-            mock_ensure.return_value = MagicMock(
-                accessible=True, was_quit=True, was_running=True
-            )
-
-            result = extract_cookies_with_relaunch()
+        result = extract_cookies_with_relaunch()
 
-            mock_ensure.assert_called_once()
-            mock_relaunch.assert_called_once()
-            assert result["session_token"] == "eyJ0eXAiOiJKV1QiLCJhbGc..."
+        assert result["session_token"] == _SECURE_SESSION
+        relaunch_mocks.sleep.assert_called_once_with(0.05)
+        relaunch_mocks.ensure.assert_not_called()
 
-    def test_extract_raises_if_chrome_not_accessible(self):
+    def test_extract_raises_if_chrome_not_accessible(self, relaunch_mocks):
         """Test that error is raised if Chrome can't be accessed."""
-        lock_error = OperationalError("database is locked")
-
-        with (
-            patch(
-                "perplexity_deep_research.cookies.check_full_disk_access"
-            ) as mock_fda,
-            patch(
-                "perplexity_deep_research.cookies.extract_cookies_raw"
-            ) as mock_extract,
-            patch(
-                "perplexity_deep_research.cookies.ensure_chrome_accessible"
-            ) as mock_ensure,
-        ):
-            mock_fda.return_value = True
-            mock_extract.side_effect = lock_error
-            mock_ensure.return_value = MagicMock(accessible=False)
+        relaunch_mocks.extract.side_effect = OperationalError("database is locked")
+        relaunch_mocks.ensure.return_value = ChromeAccessResult(
+            was_running=True, was_quit=False, accessible=False
+        )
 
-            with pytest.raises(CookieExtractionError, match="could not be closed"):
-                extract_cookies_with_relaunch()
+        with pytest.raises(CookieExtractionError, match=_ERR_CHROME_NOT_CLOSED):
+            extract_cookies_with_relaunch()
 
-    def test_extract_propagates_non_lock_errors(self):
+    def test_extract_propagates_non_lock_errors(self, relaunch_mocks):
         """Test that non-lock errors are propagated."""
-        other_error = ValueError("Some other error")
+        relaunch_mocks.extract.side_effect = ValueError("Some other error")
 
-        with (
-            patch(
-                "perplexity_deep_research.cookies.check_full_disk_access"
-            ) as mock_fda,
-            patch(
-                "perplexity_deep_research.cookies.extract_cookies_raw"
-            ) as mock_extract,
-            patch(
-                "perplexity_deep_research.cookies.ensure_chrome_accessible"
-            ) as mock_ensure,
-        ):
-            mock_fda.return_value = True
-            mock_extract.side_effect = other_error
+        with pytest.raises(ValueError, match="Some other error"):
+            extract_cookies_with_relaunch()
 
-            with pytest.raises(ValueError, match="Some other error"):
-                extract_cookies_with_relaunch()
+        relaunch_mocks.ensure.assert_not_called()
 
-            mock_ensure.assert_not_called()
-
-    def test_extract_raises_if_full_disk_access_missing(self):
+    def test_extract_raises_if_full_disk_access_missing(self, relaunch_mocks):
         """Test that error is raised if Full Disk Access is missing."""
-        with (
-            patch(
-                "perplexity_deep_research.cookies.check_full_disk_access"
-            ) as mock_fda,
-            patch(
-                "perplexity_deep_research.cookies.show_full_disk_access_dialog"
-            ) as mock_dialog,
-        ):
-            mock_fda.return_value = False
+        relaunch_mocks.fda.return_value = False
 
-            with pytest.raises(
-                CookieExtractionError, match="Full Disk Access required"
-            ):
-                extract_cookies_with_relaunch()
+        with pytest.raises(CookieExtractionError, match=_ERR_FDA):
+            extract_cookies_with_relaunch()
 
-            mock_dialog.assert_called_once()
+        relaunch_mocks.dialog.assert_called_once()
 
-    def test_extract_prompts_for_keychain_password(self):
+    def test_extract_prompts_for_keychain_password(self, relaunch_mocks):
         """Test that keychain password is prompted when needed."""
-        raw_cookies = {
-            "__Secure-next-auth.session-token": "eyJ0eXAiOiJKV1QiLCJhbGc...",
-        }
-        keychain_error = Exception("keychain access denied")
-
-        with (
-            patch(
-                "perplexity_deep_research.cookies.check_full_disk_access"
-            ) as mock_fda,
-            patch(
-                "perplexity_deep_research.cookies.extract_cookies_raw"
-            ) as mock_extract,
-            patch(
-                "perplexity_deep_research.cookies.prompt_keychain_password"
-            ) as mock_prompt,
-        ):
-            mock_fda.return_value = True
-            mock_extract.side_effect = [keychain_error, raw_cookies]
-            mock_prompt.return_value = "test_password"
+        relaunch_mocks.extract.side_effect = [
+            Exception("keychain access denied"),
+            _RAW_COOKIES,
+        ]
+        relaunch_mocks.prompt.return_value = "test_password"
 
-            result = extract_cookies_with_relaunch()
+        result = extract_cookies_with_relaunch()
 
-            mock_prompt.assert_called_once()
-            assert result["session_token"] == "eyJ0eXAiOiJKV1QiLCJhbGc..."
+        relaunch_mocks.prompt.assert_called_once()
+        assert result["session_token"] == _SECURE_SESSION
 
-    def test_extract_raises_if_keychain_cancelled(self):
+    def test_extract_raises_if_keychain_cancelled(self, relaunch_mocks):
         """Test that error is raised if keychain password prompt is cancelled."""
-        keychain_error = Exception("keychain access denied")
+        relaunch_mocks.extract.side_effect = Exception("keychain access denied")
+        relaunch_mocks.prompt.return_value = None
 
-        with (
-            patch(
-                "perplexity_deep_research.cookies.check_full_disk_access"
-            ) as mock_fda,
-            patch(
-                "perplexity_deep_research.cookies.extract_cookies_raw"
-            ) as mock_extract,
-            patch(
-                "perplexity_deep_research.cookies.prompt_keychain_password"
-            ) as mock_prompt,
-        ):
-            mock_fda.return_value = True
-            mock_extract.side_effect = keychain_error
-            mock_prompt.return_value = None
-
-            with pytest.raises(
-                CookieExtractionError, match="Keychain access cancelled"
-            ):
-                extract_cookies_with_relaunch()
+        with pytest.raises(CookieExtractionError, match=_ERR_KEYCHAIN_CANCELLED):
+            extract_cookies_with_relaunch()
 
 
 class TestGetCookies:
@@ -456,8 +526,8 @@ class TestGetCookies:
         }
         save_cookies(cookies, isolate_cookies_file)
 
-        with patch(
-            "perplexity_deep_research.cookies.extract_cookies_with_relaunch"
+        with patch.object(
+            cookies_module, "extract_cookies_with_relaunch"
         ) as mock_extract:
             result = get_cookies()
 
@@ -472,8 +542,8 @@ class TestGetCookies:
             "session_token_name": "__Secure-next-auth.session-token",
         }
 
-        with patch(
-            "perplexity_deep_research.cookies.extract_cookies_with_relaunch"
+        with patch.object(
+            cookies_module, "extract_cookies_with_relaunch"
         ) as mock_extract:
             mock_extract.return_value = fresh_cookies
 
@@ -492,15 +562,15 @@ class TestGetCookies:
         # Save with old timestamp
         old_time = (datetime.now() - timedelta(hours=25)).isoformat()
         data = {"cookies": old_cookies, "extracted_at": old_time}
-        isolate_cookies_file.write_text(json.dumps(data))
+        isolate_cookies_file.write_bytes(cookies_module._json_dumps(data))
 
         fresh_cookies = {
             "session_token": "fresh_token",
             "session_token_name": "__Secure-next-auth.session-token",
         }
 
-        with patch(
-            "perplexity_deep_research.cookies.extract_cookies_with_relaunch"
+        with patch.object(
+            cookies_module, "extract_cookies_with_relaunch"
         ) as mock_extract:
             mock_extract.return_value = fresh_cookies
 
@@ -515,73 +585,110 @@ class TestGetCookies:
 class TestDatabaseLockedDetection:
     """Tests for database lock error detection."""
 
-    def test_database_locked_detection(self):
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "database is locked",
+            "database is busy",
+            "unable to open database",
+            "disk i/o error",
+        ],
+    )
+    def test_database_locked_detection(self, message):
         """Test is_database_locked_error() detects lock patterns."""
         from perplexity_deep_research.config import is_database_locked_error
 
-        # Test various lock error messages
-        lock_errors = [
-            OperationalError("database is locked"),
-            OperationalError("database is busy"),
-            OperationalError("unable to open database"),
-            OperationalError("disk i/o error"),
-        ]
-
-        for error in lock_errors:
-            assert is_database_locked_error(error) is True
+        assert is_database_locked_error(OperationalError(message)) is True
 
-    def test_database_locked_detection_non_lock_error(self):
-        """Test is_database_locked_error() returns False for non-lock errors."""
-        from perplexity_deep_research.config import is_database_locked_error
-
-        non_lock_errors = [
+    @pytest.mark.parametrize(
+        "error",
+        [
             OperationalError("table not found"),
             ValueError("some other error"),
             RuntimeError("something else"),
-        ]
+        ],
+        ids=["operational", "value", "runtime"],
+    )
+    def test_database_locked_detection_non_lock_error(self, error):
+        """Test is_database_locked_error() returns False for non-lock errors."""
+        from perplexity_deep_research.config import is_database_locked_error
 
-        for error in non_lock_errors:
-            assert is_database_locked_error(error) is False
+        assert is_database_locked_error(error) is False
 
 
-class TestGetChromeCookiePath:
-    """Tests for get_chrome_cookie_path() function."""
+class TestGetCookiesFilePath:
+    """Tests for get_cookies_file_path() resolution and memoization."""
 
-    def test_get_chrome_cookie_path_default_profile(self, monkeypatch):
-        """Test Chrome cookie path resolution with default profile."""
-        # Mock the path existence check
-        with patch("perplexity_deep_research.cookies.Path.exists") as mock_exists:
-            mock_exists.return_value = True
-            with patch("perplexity_deep_research.cookies.Path.resolve") as mock_resolve:
-                mock_resolve.return_value = Path(
-                    "/Users/test/Library/Application Support/Google/Chrome/Default/Cookies"
-                )
+    def test_env_override(self, isolate_cookies_file):
+        """Test PERPLEXITY_COOKIES_FILE wins over XDG_DATA_HOME."""
+        from perplexity_deep_research.config import get_cookies_file_path
 
-                result = get_chrome_cookie_path()
+        assert get_cookies_file_path() == isolate_cookies_file
 
-                assert isinstance(result, str)
-                assert "Cookies" in result
+    def test_follows_env_changes(self, tmp_path, monkeypatch):
+        """Test a changed XDG_DATA_HOME is not served from the cache."""
+        from perplexity_deep_research.config import get_cookies_file_path
 
-    def test_get_chrome_cookie_path_custom_profile(self, monkeypatch):
-        """Test Chrome cookie path resolution with custom profile."""
-        with patch("perplexity_deep_research.cookies.Path.exists") as mock_exists:
-            mock_exists.return_value = True
-            with patch("perplexity_deep_research.cookies.Path.resolve") as mock_resolve:
-                mock_resolve.return_value = Path(
-                    "/Users/test/Library/Application Support/Google/Chrome/Profile 1/Cookies"
-                )
+        monkeypatch.delenv("PERPLEXITY_COOKIES_FILE", raising=False)
+        monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "a"))
+        first = get_cookies_file_path()
+        monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "b"))
+        second = get_cookies_file_path()
 
-                result = get_chrome_cookie_path(profile="Profile 1")
+        assert first == tmp_path / "a" / "perplexity-deep-research" / "cookies.json"
+        assert second == tmp_path / "b" / "perplexity-deep-research" / "cookies.json"
+        assert get_cookies_file_path() is second
 
-                assert isinstance(result, str)
-                assert "Profile 1" in result
 
-    def test_get_chrome_cookie_path_not_found(self):
-        """Test that error is raised if Chrome cookie file not found."""
-        with patch("perplexity_deep_research.cookies.Path.exists") as mock_exists:
-            mock_exists.return_value = False
+@pytest.fixture
+def chrome_dir(tmp_path, monkeypatch):
+    """Point HOME at tmp_path and return the (not yet created) Chrome data dir."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("CHROME_PROFILE", raising=False)
+    return tmp_path / "Library/Application Support/Google/Chrome"
+
+
+def _touch_cookie_db(chrome_dir: Path, profile: str) -> Path:
+    """Create an empty Cookies file for ``profile`` and return its path."""
+    cookie_file = chrome_dir / profile / "Cookies"
+    cookie_file.parent.mkdir(parents=True)
+    cookie_file.touch()
+    return cookie_file
+
 
-            with pytest.raises(
-                CookieExtractionError, match="Chrome cookie file not found"
-            ):
-                get_chrome_cookie_path()
+class TestGetChromeCookiePath:
+    """Tests for get_chrome_cookie_path() function."""
+
+    @pytest.mark.parametrize(
+        "profile,profile_dir",
+        [(None, "Default"), ("Profile 1", "Profile 1")],
+        ids=["default", "custom"],
+    )
+    def test_get_chrome_cookie_path_profile(self, chrome_dir, profile, profile_dir):
+        """Test Chrome cookie path resolution for default and custom profiles."""
+        cookie_file = _touch_cookie_db(chrome_dir, profile_dir)
+
+        result = get_chrome_cookie_path(profile=profile)
+
+        assert result == str(cookie_file.resolve())
+
+    def test_get_chrome_cookie_path_not_found(self, chrome_dir):
+        """Test that error is raised if Chrome cookie file not found."""
+        with pytest.raises(CookieExtractionError, match=_ERR_NOT_FOUND):
+            get_chrome_cookie_path()
+
+    def test_get_chrome_cookie_path_cached(self, chrome_dir):
+        """Test repeat lookups skip the stat and resolve syscalls."""
+        cookie_file = _touch_cookie_db(chrome_dir, "Default")
+
+        first = get_chrome_cookie_path()
+        # A cached hit never re-checks the filesystem
+        cookie_file.unlink()
+        second = get_chrome_cookie_path()
+
+        assert first == second
+        # Misses are not cached, and each profile is looked up separately
+        with pytest.raises(CookieExtractionError, match=_ERR_NOT_FOUND):
+            get_chrome_cookie_path(profile="Profile 1")
+        _touch_cookie_db(chrome_dir, "Profile 1")
+        assert get_chrome_cookie_path(profile="Profile 1").endswith("Profile 1/Cookies")
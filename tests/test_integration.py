@@ -1,134 +1,92 @@
 """Integration tests for perplexity-deep-research MCP server."""
 
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock
 
+from perplexity_deep_research.client import PerplexityClient
 from perplexity_deep_research.server import deep_research, ask, search, follow_up
 
+pytestmark = pytest.mark.integration
+
+
+def _expected_search(query: str, mode: str, follow_up=None) -> dict:
+    """Build the client.search() kwargs a tool call should produce."""
+    return {
+        "query": query,
+        "mode": mode,
+        "sources": ["web"],
+        "language": "en-US",
+        "follow_up": follow_up,
+    }
+
 
 class TestFullFlow:
     """Test full flow: cookies → client → tools."""
 
-    @patch("perplexity_deep_research.server.get_client")
-    def test_deep_research_full_flow(self, mock_get_client):
-        """Test deep_research tool end-to-end."""
-        # Mock client
-        mock_client = MagicMock()
-        mock_client.search.return_value = {
-            "answer": "Test answer",
-            "citations": ["https://example.com"],
-            "backend_uuid": "test-uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        # Call tool
-        result = deep_research("What is quantum computing?")
-
-        # Verify
-        assert "answer" in result
+    @pytest.mark.parametrize(
+        "tool,args,expected",
+        [
+            pytest.param(
+                deep_research,
+                ("What is quantum computing?",),
+                _expected_search("What is quantum computing?", "deep research"),
+                id="deep_research",
+            ),
+            pytest.param(
+                ask, ("What is AI?",), _expected_search("What is AI?", "pro"), id="ask"
+            ),
+            pytest.param(
+                search,
+                ("Python tutorial",),
+                _expected_search("Python tutorial", "auto"),
+                id="search",
+            ),
+            pytest.param(
+                follow_up,
+                ("Tell me more", "original-uuid"),
+                _expected_search("Tell me more", "auto", follow_up="original-uuid"),
+                id="follow_up",
+            ),
+        ],
+    )
+    def test_tool_full_flow(self, mock_client, tool, args, expected):
+        """Test each tool end-to-end down to the client.search() call."""
+        result = tool(*args)
+
         assert result["answer"] == "Test answer"
-        mock_client.search.assert_called_once_with(
-            query="What is quantum computing?",
-            mode="deep research",
-            sources=["web"],
-            language="en-US",
-            follow_up=None,
-        )
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_ask_full_flow(self, mock_get_client):
-        """Test ask tool end-to-end."""
-        mock_client = MagicMock()
-        mock_client.search.return_value = {
-            "answer": "Test answer",
-            "citations": [],
-            "backend_uuid": "test-uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        result = ask("What is AI?")
-
-        assert "answer" in result
-        mock_client.search.assert_called_once()
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_search_full_flow(self, mock_get_client):
-        """Test search tool end-to-end."""
-        mock_client = MagicMock()
-        mock_client.search.return_value = {
-            "answer": "Test answer",
-            "citations": [],
-            "backend_uuid": "test-uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        result = search("Python tutorial")
-
-        assert "answer" in result
-        mock_client.search.assert_called_once()
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_follow_up_full_flow(self, mock_get_client):
-        """Test follow_up tool end-to-end."""
-        mock_client = MagicMock()
-        mock_client.search.return_value = {
-            "answer": "Follow-up answer",
-            "citations": [],
-            "backend_uuid": "new-uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        result = follow_up("Tell me more", "original-uuid")
-
-        assert "answer" in result
-        mock_client.search.assert_called_once_with(
-            query="Tell me more",
-            mode="auto",
-            sources=["web"],
-            language="en-US",
-            follow_up="original-uuid",
-        )
+        mock_client.search.assert_called_once_with(**expected)
 
 
 class TestErrorScenarios:
     """Test error handling end-to-end."""
 
-    @patch("perplexity_deep_research.server.get_client")
-    def test_cookie_extraction_error(self, mock_get_client):
+    def test_cookie_extraction_error(self, mock_client):
         """Test error when cookie extraction fails."""
         from perplexity_deep_research.exceptions import CookieExtractionError
 
-        mock_client = MagicMock()
         mock_client.search.side_effect = CookieExtractionError("Chrome not found")
-        mock_get_client.return_value = mock_client
 
         result = deep_research("test query")
 
         assert "error" in result
         assert "Chrome not found" in result["error"]
 
-    @patch("perplexity_deep_research.server.get_client")
-    def test_authentication_error(self, mock_get_client):
+    def test_authentication_error(self, mock_client):
         """Test error when authentication fails."""
         from perplexity_deep_research.exceptions import AuthenticationError
 
-        mock_client = MagicMock()
         mock_client.search.side_effect = AuthenticationError("Auth failed")
-        mock_get_client.return_value = mock_client
 
         result = ask("test query")
 
         assert "error" in result
         assert "Auth failed" in result["error"]
 
-    @patch("perplexity_deep_research.server.get_client")
-    def test_rate_limit_error(self, mock_get_client):
+    def test_rate_limit_error(self, mock_client):
         """Test error when rate limited."""
         from perplexity_deep_research.exceptions import RateLimitError
 
-        mock_client = MagicMock()
         mock_client.search.side_effect = RateLimitError("Rate limit exceeded")
-        mock_get_client.return_value = mock_client
 
         result = search("test query")
 
@@ -136,50 +94,21 @@ class TestErrorScenarios:
         assert "Rate limit exceeded" in result["error"]
 
 
-@patch("perplexity_deep_research.client.requests.Session")
-@patch("perplexity_deep_research.client.get_cookies")
-def test_client_to_server_integration(mock_get_cookies, mock_session_class):
-    """Test integration between PerplexityClient and server logic."""
-    mock_get_cookies.return_value = {"session_token": "fake-token"}
-
-    mock_session = MagicMock()
-    mock_session_class.return_value = mock_session
-
-    # Mock the bootstrap call
-    mock_session.get.return_value = MagicMock(status_code=200)
-
-    # Mock the search request
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-
-    # SSE stream mock
-    mock_response.iter_lines.return_value = [
-        b'event: message\r\ndata: {"backend_uuid": "uuid1", "text": "[{\\"step_type\\": \\"FINAL\\", \\"content\\": {\\"answer\\": \\"{\\\\\\"answer\\\\\\": \\\\\\"Final Answer\\\\\\"}\\"}}]"}'
-    ]
-    mock_session.request.return_value = mock_response
+def test_client_to_server_integration(monkeypatch):
+    """Test the tool builds the singleton client and returns its result."""
+    mock_client_instance = Mock(spec=PerplexityClient)
+    mock_client_instance.search.return_value = {
+        "answer": "Final Answer",
+        "citations": [],
+        "backend_uuid": "uuid1",
+    }
+    mock_client_class = Mock(return_value=mock_client_instance)
+    monkeypatch.setattr(
+        "perplexity_deep_research.server.PerplexityClient", mock_client_class
+    )
 
-    from perplexity_deep_research.server import get_client, deep_research
-
-    # Reset singleton for test
-    import perplexity_deep_research.server
-
-    perplexity_deep_research.server._client = None
-
-    from perplexity_deep_research.server import deep_research
-
-    # Patch the client class to return a mock that returns our desired response
-    with patch("perplexity_deep_research.server.PerplexityClient") as mock_client_class:
-        mock_client_instance = MagicMock()
-        mock_client_class.return_value = mock_client_instance
-        mock_client_instance.search.return_value = {
-            "answer": "Final Answer",
-            "citations": [],
-            "backend_uuid": "uuid1",
-        }
-
-        result = deep_research(query="integrated test")
+    result = deep_research(query="integrated test")
 
+    mock_client_class.assert_called_once_with()
     assert result["answer"] == "Final Answer"
     assert result["backend_uuid"] == "uuid1"
-
-    assert result["backend_uuid"] == "uuid1"
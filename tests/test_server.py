@@ -1,7 +1,12 @@
 """Tests for MCP server with 5 tools."""
 
+import inspect
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import ANY, Mock
+
+from perplexity_deep_research.client import PerplexityClient
+from perplexity_deep_research.exceptions import PerplexityError, RateLimitError
 
 from perplexity_deep_research.server import (
     mcp,
@@ -14,412 +19,102 @@ from perplexity_deep_research.server import (
 )
 
 
+# inspect's marker for a parameter without a default
+_EMPTY = inspect.Parameter.empty
+
+# Tool names FastMCP registered when the server module was imported
+_REGISTERED_TOOLS = frozenset(mcp._tool_manager._tools)
+
+
 class TestExactly5ToolsRegistered:
     """Test that exactly 5 tools are registered."""
 
     def test_exactly_5_tools_registered(self):
         """Assert deep_research, ask, reason, search, follow_up are registered."""
-        from perplexity_deep_research import server
-
-        # Verify all 5 tools exist
-        assert hasattr(server, "deep_research")
-        assert hasattr(server, "ask")
-        assert hasattr(server, "reason")
-        assert hasattr(server, "search")
-        assert hasattr(server, "follow_up")
-
         # Verify they are callable
-        assert callable(server.deep_research)
-        assert callable(server.ask)
-        assert callable(server.reason)
-        assert callable(server.search)
-        assert callable(server.follow_up)
-
-        # Verify they have @mcp.tool() decorator
-        assert hasattr(mcp, "_tool_manager")
-        tool_names = list(mcp._tool_manager._tools.keys())
-
-        # Should have exactly 5 tools
-        assert len(tool_names) == 5, (
-            f"Expected 5 tools, got {len(tool_names)}: {tool_names}"
+        assert all(
+            callable(tool) for tool in (deep_research, ask, reason, search, follow_up)
         )
 
         # Should have exactly these tools
-        expected_tools = {"deep_research", "ask", "reason", "search", "follow_up"}
-        actual_tools = set(tool_names)
-        assert actual_tools == expected_tools, (
-            f"Expected {expected_tools}, got {actual_tools}"
+        expected_tools = frozenset(
+            {"deep_research", "ask", "reason", "search", "follow_up"}
+        )
+        assert _REGISTERED_TOOLS == expected_tools, (
+            f"Expected {set(expected_tools)}, got {set(_REGISTERED_TOOLS)}"
         )
 
 
-class TestDeepResearchCallable:
-    """Test deep_research tool is callable."""
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_deep_research_callable(self, mock_get_client):
-        """Call deep_research, assert returns dict."""
-        # Mock client
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Test answer",
-            "citations": ["https://example.com"],
-            "backend_uuid": "test-uuid-123",
-        }
-        mock_get_client.return_value = mock_client
-
-        # Call tool
-        result = deep_research(query="test query")
-
-        # Verify result is dict
-        assert isinstance(result, dict)
-        assert "answer" in result or "error" in result
-
-        # Verify client.search was called with correct mode
-        mock_client.search.assert_called_once()
-        call_kwargs = mock_client.search.call_args[1]
-        assert call_kwargs["mode"] == "deep research"
-        assert call_kwargs["query"] == "test query"
-        assert call_kwargs["follow_up"] is None
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_deep_research_with_custom_sources(self, mock_get_client):
-        """Test deep_research with custom sources."""
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Test answer",
-            "citations": [],
-            "backend_uuid": "uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        result = deep_research(query="test", sources=["web", "scholar"])
-
-        assert isinstance(result, dict)
-        call_kwargs = mock_client.search.call_args[1]
-        assert call_kwargs["sources"] == ["web", "scholar"]
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_deep_research_with_custom_language(self, mock_get_client):
-        """Test deep_research with custom language."""
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Test answer",
-            "citations": [],
-            "backend_uuid": "uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        result = deep_research(query="test", language="fr-FR")
-
-        assert isinstance(result, dict)
-        call_kwargs = mock_client.search.call_args[1]
-        assert call_kwargs["language"] == "fr-FR"
-
-
-class TestAskCallable:
-    """Test ask tool is callable."""
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_ask_callable(self, mock_get_client):
-        """Call ask, assert returns dict."""
-        # Mock client
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Test answer",
-            "citations": ["https://example.com"],
-            "backend_uuid": "test-uuid-456",
-        }
-        mock_get_client.return_value = mock_client
-
-        # Call tool
-        result = ask(query="test query")
-
-        # Verify result is dict
-        assert isinstance(result, dict)
-        assert "answer" in result or "error" in result
-
-        # Verify client.search was called with correct mode
-        mock_client.search.assert_called_once()
-        call_kwargs = mock_client.search.call_args[1]
-        assert call_kwargs["mode"] == "pro"
-        assert call_kwargs["query"] == "test query"
-        assert call_kwargs["follow_up"] is None
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_ask_with_custom_sources(self, mock_get_client):
-        """Test ask with custom sources."""
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Test answer",
-            "citations": [],
-            "backend_uuid": "uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        result = ask(query="test", sources=["web", "social"])
-
-        assert isinstance(result, dict)
-        call_kwargs = mock_client.search.call_args[1]
-        assert call_kwargs["sources"] == ["web", "social"]
-
-
-class TestSearchCallable:
-    """Test search tool is callable."""
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_search_callable(self, mock_get_client):
-        """Call search, assert returns dict."""
-        # Mock client
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Test answer",
-            "citations": ["https://example.com"],
-            "backend_uuid": "test-uuid-789",
-        }
-        mock_get_client.return_value = mock_client
-
-        # Call tool
-        result = search(query="test query")
-
-        # Verify result is dict
-        assert isinstance(result, dict)
-        assert "answer" in result or "error" in result
-
-        # Verify client.search was called with correct mode
-        mock_client.search.assert_called_once()
-        call_kwargs = mock_client.search.call_args[1]
-        assert call_kwargs["mode"] == "auto"
-        assert call_kwargs["query"] == "test query"
-        assert call_kwargs["follow_up"] is None
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_search_with_custom_language(self, mock_get_client):
-        """Test search with custom language."""
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Test answer",
-            "citations": [],
-            "backend_uuid": "uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        result = search(query="test", language="es-ES")
-
-        assert isinstance(result, dict)
-        call_kwargs = mock_client.search.call_args[1]
-        assert call_kwargs["language"] == "es-ES"
-
-
-class TestFollowUpCallable:
-    """Test follow_up tool is callable."""
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_follow_up_callable(self, mock_get_client):
-        """Call follow_up, assert returns dict."""
-        # Mock client
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Follow-up answer",
-            "citations": ["https://example.com"],
-            "backend_uuid": "test-uuid-follow-up",
-        }
-        mock_get_client.return_value = mock_client
-
-        # Call tool
-        result = follow_up(query="follow-up question", backend_uuid="original-uuid-123")
-
-        # Verify result is dict
-        assert isinstance(result, dict)
-        assert "answer" in result or "error" in result
-
-        # Verify client.search was called with correct parameters
-        mock_client.search.assert_called_once()
-        call_kwargs = mock_client.search.call_args[1]
-        assert call_kwargs["mode"] == "auto"
-        assert call_kwargs["query"] == "follow-up question"
-        assert call_kwargs["follow_up"] == "original-uuid-123"
-        assert call_kwargs["sources"] == ["web"]
-        assert call_kwargs["language"] == "en-US"
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_follow_up_payload_includes_uuid(self, mock_get_client):
-        """Test follow_up passes backend_uuid correctly."""
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Answer",
-            "citations": [],
-            "backend_uuid": "new-uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        backend_uuid = "test-backend-uuid-xyz"
-        result = follow_up(query="test", backend_uuid=backend_uuid)
-
-        # Verify the UUID was passed to search
-        call_kwargs = mock_client.search.call_args[1]
-        assert call_kwargs["follow_up"] == backend_uuid
-
-
-class TestToolReturnsAnswerDict:
-    """Test each tool returns dict with answer or error key."""
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_deep_research_returns_answer_dict(self, mock_get_client):
-        """Test deep_research returns dict with answer key."""
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Research answer",
-            "citations": ["https://example.com"],
-            "backend_uuid": "uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        result = deep_research(query="test")
-
-        assert isinstance(result, dict)
-        assert "answer" in result
-        assert result["answer"] == "Research answer"
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_ask_returns_answer_dict(self, mock_get_client):
-        """Test ask returns dict with answer key."""
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Pro answer",
-            "citations": [],
-            "backend_uuid": "uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        result = ask(query="test")
-
-        assert isinstance(result, dict)
-        assert "answer" in result
-        assert result["answer"] == "Pro answer"
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_search_returns_answer_dict(self, mock_get_client):
-        """Test search returns dict with answer key."""
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Search answer",
-            "citations": [],
-            "backend_uuid": "uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        result = search(query="test")
-
-        assert isinstance(result, dict)
-        assert "answer" in result
-        assert result["answer"] == "Search answer"
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_follow_up_returns_answer_dict(self, mock_get_client):
-        """Test follow_up returns dict with answer key."""
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Follow-up answer",
-            "citations": [],
-            "backend_uuid": "uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        result = follow_up(query="test", backend_uuid="uuid")
-
-        assert isinstance(result, dict)
-        assert "answer" in result
-        assert result["answer"] == "Follow-up answer"
+# (tool, extra kwargs, logical mode passed to client.search)
+_TOOLS = [
+    pytest.param(deep_research, {}, "deep research", id="deep_research"),
+    pytest.param(ask, {}, "pro", id="ask"),
+    pytest.param(reason, {}, "reasoning", id="reason"),
+    pytest.param(search, {}, "auto", id="search"),
+    pytest.param(
+        follow_up, {"backend_uuid": "original-uuid-123"}, "auto", id="follow_up"
+    ),
+]
+
+
+class TestToolCallable:
+    """Test each tool forwards its mode to the client and returns its dict."""
+
+    @pytest.mark.parametrize("tool,extra_kwargs,expected_mode", _TOOLS)
+    def test_tool_callable(self, mock_client, tool, extra_kwargs, expected_mode):
+        """Call the tool, assert the search kwargs and the returned answer dict."""
+        result = tool(query="test query", **extra_kwargs)
+
+        assert result is mock_client.search.return_value
+        mock_client.search.assert_called_once_with(
+            query="test query",
+            mode=expected_mode,
+            sources=["web"],
+            language="en-US",
+            follow_up=extra_kwargs.get("backend_uuid"),
+        )
 
 
 class TestErrorHandling:
     """Test error handling in all tools."""
 
-    @patch("perplexity_deep_research.server.get_client")
-    def test_deep_research_error_handling(self, mock_get_client):
-        """Test deep_research catches exceptions and returns error dict."""
-        mock_client = Mock()
-        mock_client.search.side_effect = Exception("Test error")
-        mock_get_client.return_value = mock_client
-
-        result = deep_research(query="test")
-
-        assert isinstance(result, dict)
-        assert "error" in result
-        assert "Test error" in result["error"]
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_ask_error_handling(self, mock_get_client):
-        """Test ask catches exceptions and returns error dict."""
-        mock_client = Mock()
-        mock_client.search.side_effect = Exception("Test error")
-        mock_get_client.return_value = mock_client
-
-        result = ask(query="test")
-
-        assert isinstance(result, dict)
-        assert "error" in result
-        assert "Test error" in result["error"]
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_search_error_handling(self, mock_get_client):
-        """Test search catches exceptions and returns error dict."""
-        mock_client = Mock()
-        mock_client.search.side_effect = Exception("Test error")
-        mock_get_client.return_value = mock_client
-
-        result = search(query="test")
-
-        assert isinstance(result, dict)
-        assert "error" in result
-        assert "Test error" in result["error"]
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_follow_up_error_handling(self, mock_get_client):
-        """Test follow_up catches exceptions and returns error dict."""
-        mock_client = Mock()
-        mock_client.search.side_effect = Exception("Test error")
-        mock_get_client.return_value = mock_client
-
-        result = follow_up(query="test", backend_uuid="uuid")
-
-        assert isinstance(result, dict)
-        assert "error" in result
-        assert "Test error" in result["error"]
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_error_handling_with_different_exception_types(self, mock_get_client):
-        """Test error handling with various exception types."""
-        mock_client = Mock()
-
-        # Test with ValueError
-        mock_client.search.side_effect = ValueError("Value error")
-        mock_get_client.return_value = mock_client
-        result = deep_research(query="test")
-        assert "error" in result
-        assert "Value error" in result["error"]
-
-        # Test with RuntimeError
-        mock_client.search.side_effect = RuntimeError("Runtime error")
-        result = ask(query="test")
-        assert "error" in result
-        assert "Runtime error" in result["error"]
+    @pytest.mark.parametrize(
+        "tool,extra_kwargs,exc",
+        # Every tool with the base error, plus one subclass
+        [pytest.param(*p.values[:2], PerplexityError, id=p.id) for p in _TOOLS]
+        + [pytest.param(deep_research, {}, RateLimitError, id="rate_limit")],
+    )
+    def test_tool_error_handling(self, mock_client, tool, extra_kwargs, exc):
+        """Test PerplexityError and its subclasses come back as an error dict."""
+        mock_client.search.side_effect = exc("Test error")
+
+        result = tool(query="test", **extra_kwargs)
+
+        assert result == {"error": "Test error"}
+
+    @pytest.mark.parametrize("exc", [ValueError, RuntimeError])
+    def test_unexpected_errors_propagate(self, mock_client, exc):
+        """Test programming errors are not swallowed and reach FastMCP."""
+        mock_client.search.side_effect = exc("Unexpected error")
+
+        with pytest.raises(exc, match="Unexpected error"):
+            ask(query="test")
 
 
 class TestLazySingleton:
     """Test lazy singleton pattern for get_client."""
 
-    @patch("perplexity_deep_research.server.PerplexityClient")
+    @pytest.fixture
+    def mock_client_class(self, monkeypatch):
+        """Replace server.PerplexityClient with a class mock building one instance."""
+        mock_client_class = Mock(return_value=Mock(spec=PerplexityClient))
+        monkeypatch.setattr(
+            "perplexity_deep_research.server.PerplexityClient", mock_client_class
+        )
+        return mock_client_class
+
     def test_get_client_creates_client_once(self, mock_client_class):
         """Test get_client creates client only once."""
-        # Reset the global _client
-        import perplexity_deep_research.server as server_module
-
-        server_module._client = None
-
-        mock_instance = Mock()
-        mock_client_class.return_value = mock_instance
-
         # First call should create client
         client1 = get_client()
         assert mock_client_class.call_count == 1
@@ -431,101 +126,165 @@ class TestLazySingleton:
         # Both should be the same object
         assert client1 is client2
 
-    @patch("perplexity_deep_research.server.PerplexityClient")
     def test_get_client_returns_perplexity_client(self, mock_client_class):
         """Test get_client returns PerplexityClient instance."""
-        import perplexity_deep_research.server as server_module
-
-        server_module._client = None
-
-        mock_instance = Mock()
-        mock_client_class.return_value = mock_instance
-
         client = get_client()
 
-        assert client is mock_instance
+        assert client is mock_client_class.return_value
 
 
 class TestToolSignatures:
     """Test tool signatures match specification."""
 
-    @patch("perplexity_deep_research.server.get_client")
-    def test_deep_research_signature(self, mock_get_client):
-        """Test deep_research has correct signature."""
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Test",
-            "citations": [],
-            "backend_uuid": "uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        # Test with all parameters
-        result = deep_research(
-            query="test query", sources=["web", "scholar"], language="en-US"
+    @pytest.mark.parametrize(
+        "tool,expected_params",
+        [
+            (
+                deep_research,
+                {"query": _EMPTY, "sources": ("web",), "language": "en-US"},
+            ),
+            (ask, {"query": _EMPTY, "sources": ("web",), "language": "en-US"}),
+            (reason, {"query": _EMPTY, "sources": ("web",), "language": "en-US"}),
+            (search, {"query": _EMPTY, "sources": ("web",), "language": "en-US"}),
+            (follow_up, {"query": _EMPTY, "backend_uuid": _EMPTY}),
+        ],
+    )
+    def test_signature(self, tool, expected_params):
+        """Test parameter names, order and defaults without calling the tool."""
+        params = inspect.signature(tool).parameters
+
+        assert {name: p.default for name, p in params.items()} == expected_params
+        assert list(params) == list(expected_params)
+
+    @pytest.mark.parametrize(
+        "tool,kwargs",
+        [
+            (deep_research, {"sources": ["web", "scholar"]}),
+            (ask, {"sources": ["web", "social"], "language": "fr-FR"}),
+            (reason, {"sources": ["scholar"], "language": "de-DE"}),
+            (search, {"language": "es-ES"}),
+        ],
+    )
+    def test_tool_forwards_sources_and_language(self, mock_client, tool, kwargs):
+        """Test non-default sources/language reach client.search."""
+        tool(query="test query", **kwargs)
+
+        mock_client.search.assert_called_once_with(
+            query="test query",
+            mode=ANY,
+            sources=kwargs.get("sources", ["web"]),
+            language=kwargs.get("language", "en-US"),
+            follow_up=None,
+        )
+
+    def test_default_sources_not_shared(self, mock_client):
+        """Test each call gets its own sources list from the shared default."""
+        ask(query="first")
+        mock_client.search.call_args[1]["sources"].append("scholar")
+        ask(query="second")
+
+        assert mock_client.search.call_args[1]["sources"] == ["web"]
+
+
+class TestGetClientSingleton:
+    """Test lazy client construction and startup warm-up."""
+
+    def test_concurrent_first_calls_build_one_client(self, monkeypatch):
+        """Test racing first calls share a single PerplexityClient."""
+        import threading
+        import time
+
+        def slow_client():
+            time.sleep(0.05)
+            return Mock(spec=PerplexityClient)
+
+        mock_cls = Mock(side_effect=slow_client)
+        monkeypatch.setattr(
+            "perplexity_deep_research.server.PerplexityClient", mock_cls
         )
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_client()))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        mock_cls.assert_called_once()
+        assert all(r is results[0] for r in results)
+
+    def test_main_warms_client_in_background_and_survives_failure(self, monkeypatch):
+        """Test main() warms from cached cookies off-thread, even if that fails."""
+        import threading
+
+        from perplexity_deep_research import server
+
+        warmed = threading.Event()
+
+        def failing_get_client():
+            warmed.set()
+            raise RuntimeError("session bootstrap failed")
+
+        mock_get_client = Mock(side_effect=failing_get_client)
+        mock_run = Mock()
+        monkeypatch.setattr(server, "load_cookies", lambda: {"session_token": "t"})
+        monkeypatch.setattr(server, "get_client", mock_get_client)
+        monkeypatch.setattr(server.mcp, "run", mock_run)
+        monkeypatch.setattr("logging.basicConfig", lambda **_: None)
+
+        server.main()
+
+        assert warmed.wait(timeout=5)
+        mock_get_client.assert_called_once()
+        mock_run.assert_called_once()
+
+    @staticmethod
+    def _join_warmup() -> None:
+        """Wait for main()'s background warm-up thread, if still running."""
+        import threading
+
+        for thread in threading.enumerate():
+            if thread.name == "client-warmup":
+                thread.join(timeout=5)
+
+    def test_main_skips_warmup_without_cached_cookies(self, monkeypatch):
+        """Test main() never extracts cookies (dialogs, Chrome quit) at startup."""
+        from perplexity_deep_research import server
+
+        mock_get_client = Mock()
+        mock_run = Mock()
+        monkeypatch.setattr(server, "load_cookies", lambda: None)
+        monkeypatch.setattr(server, "get_client", mock_get_client)
+        monkeypatch.setattr(server.mcp, "run", mock_run)
+        monkeypatch.setattr("logging.basicConfig", lambda **_: None)
+
+        server.main()
+        self._join_warmup()
+
+        mock_get_client.assert_not_called()
+        mock_run.assert_called_once()
+
+    def test_main_serves_despite_corrupt_cookies_file(
+        self, monkeypatch, tmp_path, caplog
+    ):
+        """Test a truncated cookies file defers warm-up instead of blocking startup."""
+        from perplexity_deep_research import server
 
-        assert isinstance(result, dict)
-        call_kwargs = mock_client.search.call_args[1]
-        assert call_kwargs["query"] == "test query"
-        assert call_kwargs["sources"] == ["web", "scholar"]
-        assert call_kwargs["language"] == "en-US"
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_ask_signature(self, mock_get_client):
-        """Test ask has correct signature."""
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Test",
-            "citations": [],
-            "backend_uuid": "uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        # Test with all parameters
-        result = ask(query="test query", sources=["web"], language="fr-FR")
-
-        assert isinstance(result, dict)
-        call_kwargs = mock_client.search.call_args[1]
-        assert call_kwargs["query"] == "test query"
-        assert call_kwargs["sources"] == ["web"]
-        assert call_kwargs["language"] == "fr-FR"
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_search_signature(self, mock_get_client):
-        """Test search has correct signature."""
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Test",
-            "citations": [],
-            "backend_uuid": "uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        # Test with all parameters
-        result = search(query="test query", sources=["web"], language="en-US")
-
-        assert isinstance(result, dict)
-        call_kwargs = mock_client.search.call_args[1]
-        assert call_kwargs["query"] == "test query"
-        assert call_kwargs["sources"] == ["web"]
-        assert call_kwargs["language"] == "en-US"
-
-    @patch("perplexity_deep_research.server.get_client")
-    def test_follow_up_signature(self, mock_get_client):
-        """Test follow_up has correct signature."""
-        mock_client = Mock()
-        mock_client.search.return_value = {
-            "answer": "Test",
-            "citations": [],
-            "backend_uuid": "uuid",
-        }
-        mock_get_client.return_value = mock_client
-
-        # Test with required parameters
-        result = follow_up(query="follow-up", backend_uuid="test-uuid")
-
-        assert isinstance(result, dict)
-        call_kwargs = mock_client.search.call_args[1]
-        assert call_kwargs["query"] == "follow-up"
-        assert call_kwargs["follow_up"] == "test-uuid"
+        cookies_file = tmp_path / "cookies.json"
+        cookies_file.write_text('{"cookies": ')
+        mock_get_client = Mock()
+        mock_run = Mock()
+        monkeypatch.setenv("PERPLEXITY_COOKIES_FILE", str(cookies_file))
+        monkeypatch.setattr(server, "get_client", mock_get_client)
+        monkeypatch.setattr(server.mcp, "run", mock_run)
+        monkeypatch.setattr("logging.basicConfig", lambda **_: None)
+
+        with caplog.at_level("WARNING", logger="perplexity-deep-research"):
+            server.main()
+            self._join_warmup()
+
+        mock_run.assert_called_once()
+        mock_get_client.assert_not_called()
+        assert "Client initialization deferred" in caplog.text